@@ -0,0 +1,108 @@
+"""Compares the compiled `RouteTrie` with the previous linear scan over `PageAdmin` (`FletAppX._verify_url`).
+
+The linear side is a frozen copy of the `_verify_url` that shipped before the trie (regex per page, with its
+unbounded dict of compiled patterns), so the comparison does not depend on the current `FletAppX` internals.
+
+Run:
+```
+python benchmarks/bench_routing.py
+```
+"""
+
+from re import Pattern, compile, escape
+from timeit import timeit
+from typing import Callable, Dict, Optional, Tuple
+
+from cst_ui.basic.app.my_types import TYPE_PATTERNS
+from cst_ui.basic.app.page_admin import PageAdmin
+from cst_ui.basic.app.route_trie import RouteTrie
+
+_compiled_patterns_cache: Dict[str, Pattern[str]] = {}
+
+
+def _compile_pattern(pattern_parts: list[str]) -> Pattern[str]:
+    pattern_key = "/".join(pattern_parts)
+    if pattern_key not in _compiled_patterns_cache:
+        _compiled_patterns_cache[pattern_key] = compile(f"^/{pattern_key}/?$")
+    return _compiled_patterns_cache[pattern_key]
+
+
+def baseline_verify_url(
+    url_pattern: str,
+    url: str,
+    custom_types: Optional[Dict[str, Callable[[str], Optional[bool]]]] = None,
+) -> Optional[Dict[str, Optional[bool]]]:
+    """The `FletAppX._verify_url` of the linear scan, kept as it was."""
+    combined_patterns = {
+        **TYPE_PATTERNS,
+        **{k: (compile(r"[^/]+"), v) for k, v in (custom_types or {}).items()},
+    }
+
+    segments: list[Tuple[str, Callable[[str], Optional[bool]]]] = []
+    pattern_parts: list[str] = []
+    type_patterns: list[str] = []
+
+    for segment in url_pattern.strip("/").split("/"):
+        try:
+            if segment == "":
+                continue
+
+            if segment[0] in "<{" and segment[-1] in ">}":
+                name, type_ = segment[1:-1].split(":", 1) if ":" in segment else (segment[1:-1], "str")
+                type_patterns.append(type_)
+                regex_part, parser = combined_patterns[type_]
+                pattern_parts.append(f"({regex_part.pattern})")
+                segments.append((name, parser))
+            else:
+                pattern_parts.append(escape(segment))
+        except KeyError as e:
+            raise ValueError(f"Unrecognized data type: {e}")
+    if custom_types and type_ not in custom_types:
+        raise ValueError(f"A custom data type is not being used: {custom_types.keys()}")
+
+    pattern = _compile_pattern(pattern_parts)
+    match = pattern.fullmatch(url)
+    if not match:
+        return None
+
+    result = {name: parser(match.group(i + 1)) for i, (name, parser) in enumerate(segments)}
+
+    return None if None in result.values() else result
+
+
+def view(data):
+    return None
+
+
+def build_pages(n: int) -> list[PageAdmin]:
+    pages = []
+    for i in range(n // 2):
+        pages.append(PageAdmin(f"/section-{i}/list", view))
+        pages.append(PageAdmin(f"/section-{i}/item/{{id:int}}/{{name:str}}", view))
+    return pages
+
+
+def linear_scan(pages: list[PageAdmin], url: str):
+    for page in pages:
+        url_params = baseline_verify_url(page.route, url, page.custom_params)
+        if url_params is not None:
+            return page, url_params
+    return None
+
+
+def main(number: int = 2000):
+    print(f"{'routes':>8} | {'linear (us)':>12} | {'trie (us)':>10} | {'speedup':>8}")
+    for n in (10, 100, 1000):
+        pages = build_pages(n)
+        routes = RouteTrie(pages)
+        # Worst case for the linear scan: the last registered route.
+        url = f"/section-{n // 2 - 1}/item/42/flet"
+        assert linear_scan(pages, url) == routes.resolve(url)
+
+        linear = timeit(lambda: linear_scan(pages, url), number=number) / number * 1e6
+        trie = timeit(lambda: routes.resolve(url), number=number) / number * 1e6
+        print(f"{n:>8} | {linear:>12.2f} | {trie:>10.2f} | {linear / trie:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
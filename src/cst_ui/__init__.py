@@ -13,6 +13,9 @@ from .basic.app import (
     EncryptAlgorithm,
     Job,
     KeyboardAdmin,
+    KeyPool,
+    NavigationRecord,
+    NavigationStats,
     PageAdmin,
     PemKey,
     Redirect,
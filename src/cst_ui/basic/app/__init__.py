@@ -2,7 +2,8 @@
 from .data_admin import DataAdmin
 from .flet_app import App, page  # TODO: page：该功能会报错
 from .inheritance import KeyboardAdmin, ResizeAdmin, ResponsiveControl
-from .jwt import AppKey, decode, decode_async
+from .jwt import AppKey, KeyPool, decode, decode_async
 from .my_types import EncryptAlgorithm, Job, PemKey, Redirect, SecretKey, encode_HS256, encode_RS256
 from .page_admin import AddPageAdmin, PageAdmin
 from .route import auto_routing
+from .timing import NavigationRecord, NavigationStats
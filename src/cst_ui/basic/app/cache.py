@@ -0,0 +1,247 @@
+from asyncio import get_running_loop, shield, wrap_future
+from collections import OrderedDict, namedtuple
+from concurrent.futures import Future
+from inspect import iscoroutinefunction
+from threading import RLock
+from time import monotonic
+from typing import Any, Awaitable, Callable, Hashable, Optional, Tuple, Union
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "evictions", "maxsize", "currsize"])
+
+
+class LRUCache:
+    """Bounded least-recently-used cache, safe to share between the sessions (threads) of the app.
+
+    * `maxsize` : Maximum number of entries, `None` disables the limit.
+
+    Example:
+    ```python
+    cache = LRUCache(maxsize=2)
+    cache.set("a", 1)
+    cache.get("a")  # -> 1
+    cache.info()  # -> CacheInfo(hits=1, misses=0, evictions=0, maxsize=2, currsize=1)
+    ```
+    """
+
+    def __init__(self, maxsize: Optional[int] = 128):
+        assert maxsize is None or maxsize > 0, "The 'maxsize' of the cache must be greater than 0."
+        self.__data: OrderedDict[Hashable, Any] = OrderedDict()
+        self.__maxsize = maxsize
+        self.__lock = RLock()
+        self.__hits = 0
+        self.__misses = 0
+        self.__evictions = 0
+
+    def __len__(self) -> int:
+        return len(self.__data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self.__data
+
+    @property
+    def maxsize(self) -> Optional[int]:
+        return self.__maxsize
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Returns the value of the key (marking it as recently used), or `default`."""
+        with self.__lock:
+            try:
+                value = self.__data[key]
+            except KeyError:
+                self.__misses += 1
+                return default
+            self.__data.move_to_end(key)
+            self.__hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any) -> Any:
+        """Stores the value and evicts the least recently used entries above `maxsize`."""
+        with self.__lock:
+            self.__data[key] = value
+            self.__data.move_to_end(key)
+            self.__trim()
+            return value
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        with self.__lock:
+            return self.__data.pop(key, default)
+
+    def clear(self):
+        with self.__lock:
+            self.__data.clear()
+
+    def resize(self, maxsize: Optional[int]):
+        """Changes `maxsize`, evicting entries if the cache is now too large."""
+        assert maxsize is None or maxsize > 0, "The 'maxsize' of the cache must be greater than 0."
+        with self.__lock:
+            self.__maxsize = maxsize
+            self.__trim()
+
+    def info(self) -> CacheInfo:
+        """Hit / miss / eviction counters, useful to size the cache."""
+        with self.__lock:
+            return CacheInfo(self.__hits, self.__misses, self.__evictions, self.__maxsize, len(self.__data))
+
+    def __trim(self):
+        if self.__maxsize is None:
+            return
+        while len(self.__data) > self.__maxsize:
+            self.__data.popitem(last=False)
+            self.__evictions += 1
+
+
+class _LoadCancelled(Exception):
+    """The load of the key was cancelled, the sessions waiting for it load it again."""
+
+
+class _Entry:
+    __slots__ = ("future", "expires")
+
+    def __init__(self):
+        self.future: Future = Future()
+        self.expires: Optional[float] = None
+
+
+class SharedCache:
+    """Cache shared by every session of the app (`App.shared_cache` / `data.shared_cache`), for reference data
+    such as lookup tables or the options of a `SelectBox`.
+
+    It is single-flight: while a key is being loaded, the other sessions that ask for it wait for that load
+    instead of starting their own. Failed loads are not cached. The values are shared, treat them as immutable.
+
+    * `maxsize` : Maximum number of keys (LRU), `None` disables the limit.
+    * `ttl` : Default seconds that a value is valid, `None` means that it does not expire.
+
+    Example:
+    ```python
+    async def countries():
+        return await fetch_countries()
+
+    options = await data.shared_cache.get_or_load_async("countries", countries, ttl=3600)
+    options = data.shared_cache.get_or_load("units", load_units)  # -> sync code
+    ```
+    """
+
+    def __init__(self, maxsize: Optional[int] = 256, ttl: Optional[float] = None):
+        self.__entries = LRUCache(maxsize)
+        self.__lock = RLock()
+        self.ttl = ttl
+        self.__hits = 0
+        self.__misses = 0
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self.__lock:
+            return self.__valid(self.__entries.get(key)) is not None
+
+    @staticmethod
+    def __valid(entry: Optional[_Entry]) -> Optional[_Entry]:
+        if entry is not None and entry.expires is not None and entry.expires <= monotonic():
+            return None
+        return entry
+
+    def __claim(self, key: Hashable) -> Tuple[_Entry, bool]:
+        """Returns the entry of the key and whether the caller must load it."""
+        with self.__lock:
+            entry = self.__valid(self.__entries.get(key))
+            if entry is not None:
+                self.__hits += 1
+                return entry, False
+            self.__misses += 1
+            return self.__entries.set(key, _Entry()), True
+
+    def __resolve(self, entry: _Entry, value: Any, ttl: Optional[float]):
+        ttl = self.ttl if ttl is None else ttl
+        entry.expires = monotonic() + ttl if ttl is not None else None
+        entry.future.set_result(value)
+
+    def __fail(self, key: Hashable, entry: _Entry, error: BaseException):
+        with self.__lock:
+            if self.__entries.get(key) is entry:
+                self.__entries.pop(key)
+        entry.future.set_exception(error)
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any], ttl: Optional[float] = None) -> Any:
+        """Returns the value of the key, calling `loader()` only if no other session is already loading it.
+
+        It blocks while the value is loaded, use `get_or_load_async` on the event loop.
+        """
+        while True:
+            entry, load = self.__claim(key)
+            if load:
+                try:
+                    value = loader()
+                except Exception as e:
+                    self.__fail(key, entry, e)
+                    raise
+                except BaseException:
+                    self.__fail(key, entry, _LoadCancelled())
+                    raise
+                self.__resolve(entry, value, ttl)
+            try:
+                return entry.future.result()
+            except _LoadCancelled:
+                continue
+
+    async def get_or_load_async(
+        self, key: Hashable, loader: Callable[[], Union[Any, Awaitable[Any]]], ttl: Optional[float] = None
+    ) -> Any:
+        """Same as `get_or_load` without blocking the event loop, sync loaders run in the executor.
+
+        If the session loading the key is cancelled (navigation, disconnect...), the claim is released and the
+        sessions waiting for it load the key again.
+        """
+        while True:
+            entry, load = self.__claim(key)
+            if load:
+                try:
+                    if iscoroutinefunction(loader):
+                        value = await loader()
+                    else:
+                        value = await get_running_loop().run_in_executor(None, loader)
+                except Exception as e:
+                    self.__fail(key, entry, e)
+                    raise
+                except BaseException:
+                    # `CancelledError`: it is not the result of the load.
+                    self.__fail(key, entry, _LoadCancelled())
+                    raise
+                self.__resolve(entry, value, ttl)
+            try:
+                if entry.future.done():
+                    return entry.future.result()
+                # A cancelled waiter must not cancel the shared future.
+                return await shield(wrap_future(entry.future))
+            except _LoadCancelled:
+                continue
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Returns the loaded value of the key, or `default` (it does not wait for a load in progress)."""
+        with self.__lock:
+            entry = self.__valid(self.__entries.get(key))
+        if entry is None or not entry.future.done() or entry.future.exception() is not None:
+            return default
+        return entry.future.result()
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> Any:
+        entry = _Entry()
+        self.__resolve(entry, value, ttl)
+        with self.__lock:
+            self.__entries.set(key, entry)
+        return value
+
+    def invalidate(self, key: Hashable):
+        """Removes the key, the next request loads it again."""
+        with self.__lock:
+            self.__entries.pop(key)
+
+    def clear(self):
+        with self.__lock:
+            self.__entries.clear()
+
+    def info(self) -> CacheInfo:
+        with self.__lock:
+            evictions = self.__entries.info().evictions
+            return CacheInfo(self.__hits, self.__misses, evictions, self.__entries.maxsize, len(self.__entries))
@@ -1,9 +1,11 @@
 from collections import deque
 from datetime import datetime, timedelta, timezone
-from typing import Any, Callable, Dict, Deque, Union
+from time import monotonic, time
+from typing import Any, Awaitable, Callable, Dict, Deque, Tuple, Union
 
 from flet import Page, View, KeyboardEvent
 
+from .cache import LRUCache, SharedCache
 from .my_types import Msg, Redirect
 from .my_types import (
     SecretKey,
@@ -11,10 +13,25 @@ from .my_types import (
     encode_verified,
 )
 from .inheritance import KeyboardAdmin, ResizeAdmin, SessionStorageEdit
+from .session_sync import SessionSync, session_id
 
 from .my_types import Job
 
 
+class _LoginState:
+    """Login state of the session, shared by the copies of its `DataAdmin` (prefetched pages), so that a
+    `login()` / `logout()` called from any of them is seen by all."""
+
+    __slots__ = ("key_login", "login_done", "sleep", "result")
+
+    def __init__(self):
+        self.key_login: str | None = None
+        self.login_done: bool = False
+        self.sleep: int = 1
+        # (expiry of the cache, result of the `login` decorator of the app)
+        self.result: Tuple[float, Any] | None = None
+
+
 class DataAdmin:
     def __init__(
         self,
@@ -28,6 +45,15 @@ class DataAdmin:
         page_on_resize: ResizeAdmin,
         login_async: bool = False,
         go: Callable[[str], None] | None = None,
+        go_async: Callable[[str], Awaitable[None]] | None = None,
+        view_cache: LRUCache | None = None,
+        prefetch: Callable[[str], Any] | None = None,
+        prefetched: LRUCache | None = None,
+        history_depth: int | None = None,
+        login_cache_ttl: float | None = None,
+        session_sync: SessionSync | None = None,
+        share_max_bytes: int | None = None,
+        shared_cache: SharedCache | None = None,
     ) -> None:
         """程序层面数据管理
 
@@ -42,6 +68,15 @@ class DataAdmin:
             page_on_resize (ResizeAdmin): 该页面resize的动作
             login_async (bool, optional): _description_. Defaults to False.
             go (Callable[[str], None], optional): _description_. Defaults to None.
+            go_async (Callable[[str], Awaitable[None]], optional): 异步导航. Defaults to None.
+            view_cache (LRUCache, optional): 缓存 keep_alive 页面的 View. Defaults to None.
+            prefetch (Callable[[str], Any], optional): 后台预先构建页面的 View. Defaults to None.
+            prefetched (LRUCache, optional): 预先构建的 View (任务), 登录或退出时清空. Defaults to None.
+            history_depth (int, optional): 路由历史的最大长度, None 表示不限制. Defaults to None.
+            login_cache_ttl (float, optional): 登录检查结果的缓存秒数, None 表示不缓存. Defaults to None.
+            session_sync (SessionSync, optional): 合并会话间同步的 Msg, None 表示立即发送. Defaults to None.
+            share_max_bytes (int, optional): share 的内存上限(字节), 超出时按 LRU 移除, None 表示不限制. Defaults to None.
+            shared_cache (SharedCache, optional): 所有会话共享的缓存 (App.shared_cache). Defaults to None.
         """
         self.__page: Page = page
         self.__url_params: Dict[str, Any] | None = None
@@ -49,19 +84,26 @@ class DataAdmin:
         self.__route_prefix = route_prefix
         self.__route_init = route_init
         self.__route_login = route_login
-        self.__share = SessionStorageEdit()
+        self.__share = SessionStorageEdit(share_max_bytes)
+        self.__shared_cache = shared_cache if shared_cache is not None else SharedCache()
         self.__on_keyboard_event = page_on_keyboard
         self.__on_resize = page_on_resize
         self.__route: str | None = None
         self.__go = go
-        self.__history_routes: deque[str] = deque()
+        self.__go_async = go_async
+        self.__history_routes: deque[str] = deque(maxlen=history_depth)
+        self.__view_cache = view_cache
+        self.__prefetch = prefetch
+        self.__prefetched = prefetched
 
         self.__secret_key: SecretKey = secret_key
         self.__auto_logout: bool = auto_logout
-        self.__sleep: int = 1
-        self._key_login: str | None = None
-        self._login_done: bool = False
+        self.__login = _LoginState()
         self._login_async: bool = login_async
+        self.__jobs: list[Job] = []
+        self.__verified_payloads: Dict[str, Dict[str, Any]] = {}
+        self.__login_cache_ttl = login_cache_ttl
+        self.__session_sync = session_sync if session_sync is not None else SessionSync(window=None)
 
     @property
     def page(self):
@@ -123,6 +165,16 @@ class DataAdmin:
     def share(self):
         return self.__share
 
+    @property
+    def shared_cache(self) -> SharedCache:
+        """Cache shared by every session of the app, see `App.shared_cache`."""
+        return self.__shared_cache
+
+    @property
+    def view_cache(self) -> LRUCache | None:
+        """Cache of the `View` of the pages with `keep_alive`, use `clear()` or `pop((route, params))` to rebuild them."""
+        return self.__view_cache
+
     # events
     @property
     def on_keyboard_event(self) -> KeyboardEvent:
@@ -142,7 +194,23 @@ class DataAdmin:
 
     @property
     def key_login(self):
-        return self._key_login
+        return self.__login.key_login
+
+    @property
+    def _key_login(self) -> str | None:
+        return self.__login.key_login
+
+    @_key_login.setter
+    def _key_login(self, key_login: str | None):
+        self.__login.key_login = key_login
+
+    @property
+    def _login_done(self) -> bool:
+        return self.__login.login_done
+
+    @_login_done.setter
+    def _login_done(self, login_done: bool):
+        self.__login.login_done = login_done
 
     @property
     def auto_logout(self):
@@ -165,20 +233,92 @@ class DataAdmin:
     def _login_done_evaluate(self):
         return self._login_done
 
+    def _cache_payload(self, key: str, payload: Dict[str, Any]):
+        """Stores the verified payload of the jwt of the session, until its `exp`.
+
+        It is keyed by the storage key (not by the token), so that a hit does not read the client storage. The
+        entry is dropped by `login()`, `logout()` and the login / logout messages of the other sessions; a token
+        changed in the client storage in any other way is not noticed until the `exp` of the cached payload.
+        """
+        self.__verified_payloads[key] = payload
+
+    def _cached_payload(self, key: str) -> Dict[str, Any] | None:
+        """Returns the verified payload of the key if it has not expired."""
+        payload = self.__verified_payloads.get(key)
+        if payload is None:
+            return None
+        exp = payload.get("exp")
+        if exp is not None and float(exp) <= time():
+            del self.__verified_payloads[key]
+            return None
+        return payload
+
+    def _invalidate_token(self, key: str | None = None):
+        if key is None:
+            self.__verified_payloads.clear()
+        else:
+            self.__verified_payloads.pop(key, None)
+
+    def _cached_login(self) -> Any:
+        """Returns the last truthy result of the `login` decorator of the app while its ttl has not expired."""
+        if self.__login.result is None:
+            return None
+        expires, result = self.__login.result
+        if monotonic() >= expires:
+            self.__login.result = None
+            return None
+        return result
+
+    def _cache_login(self, result: Any):
+        if self.__login_cache_ttl is not None and result:
+            self.__login.result = (monotonic() + self.__login_cache_ttl, result)
+
+    def _invalidate_login(self):
+        """Forgets the login result and the `View` built for the previous user (keep-alive and prefetched)."""
+        self.__login.result = None
+        if self.__view_cache is not None:
+            self.__view_cache.clear()
+        if self.__prefetched is not None:
+            self.__prefetched.clear()
+
+    @property
+    def _sessions_topic(self) -> str:
+        return self.page.client_ip + self.page.client_user_agent
+
+    def _send_all(self, topic: str, msg: Msg):
+        self.__session_sync.send_all(self.page, topic, msg)
+
+    def _send_others(self, topic: str, msg: Msg):
+        self.__session_sync.send_others(self.page, topic, msg)
+
     def _create_task_login_update(self, decode: Dict[str, Any]):
         """Updates the login status, in case it does not exist it creates a new task that checks the user's login status."""
         time_exp = datetime.fromtimestamp(float(decode.get("exp")), tz=timezone.utc)
         time_now = datetime.now(tz=timezone.utc)
         time_res = time_exp - time_now
         self._login_done = True
-        Job(
-            func=self.logout,
-            key=self.key_login,
-            every=time_res,
-            page=self.page,
-            login_done=self._login_done_evaluate,
-            sleep_time=self.__sleep,
-        ).start()
+        self.__start_job(
+            Job(
+                func=self.logout,
+                key=self.key_login,
+                every=time_res,
+                page=self.page,
+                login_done=self._login_done_evaluate,
+                sleep_time=self.__login.sleep,
+            )
+        )
+
+    def __start_job(self, job: Job):
+        """Only the last logout task of the session is kept."""
+        self._cancel_jobs()
+        self.__jobs.append(job)
+        job.start()
+
+    def _cancel_jobs(self):
+        """Cancels the logout tasks of the session (logout or disconnection)."""
+        for job in self.__jobs:
+            job.stop()
+        self.__jobs.clear()
 
     def logout(self, key: str):
         """Closes the sessions of all browser tabs or the device used, which has been previously configured with the `login` method.
@@ -199,10 +339,11 @@ class DataAdmin:
 
         def execute(key: str):
             assert self.route_login is not None, "Adds a login path in the FletApp Class"
+            self._cancel_jobs()
+            self._invalidate_token(key)
+            self._invalidate_login()
             if self.page.web:
-                self.page.pubsub.send_all_on_topic(
-                    self.page.client_ip + self.page.client_user_agent, Msg("logout", key)
-                )
+                self._send_all(self._sessions_topic, Msg("logout", key))
             else:
                 self.page.run_task(self.page.client_storage.remove_async, key)
                 self.page.go(self.route_login)
@@ -210,13 +351,25 @@ class DataAdmin:
         return lambda _=None: execute(key)
 
     async def __logaut_init(self, topic, msg: Msg):
-        if msg.method == "login":
+        if msg.method == "batch":
+            # Messages coalesced by `SessionSync`, the ones sent only by this session are skipped.
+            session = frozenset((session_id(self.page),))
+            for batch_msg, origins in msg.value:
+                if origins != session:
+                    await self.__logaut_init(topic, batch_msg)
+
+        elif msg.method == "login":
+            self._invalidate_token(msg.key)
+            self._invalidate_login()
             await self.page.client_storage.set_async(msg.key, msg.value.get("value"))
             if self.page.route == self.route_login:
                 self.page.go(msg.value.get("next_route"))
 
         elif msg.method == "logout":
             self._login_done = False
+            self._cancel_jobs()
+            self._invalidate_token(msg.key)
+            self._invalidate_login()
             await self.page.client_storage.remove_async(msg.key)
             self.page.go(self.route_login)
 
@@ -225,8 +378,10 @@ class DataAdmin:
 
         elif msg.method == "updateLoginSessions":
             self._login_done = msg.value
-            self._create_task_login_update(
-                decode=await _decode_payload_async(
+            # The payload already verified by this session avoids reading the client storage again.
+            decode = self._cached_payload(self.key_login)
+            if decode is None:
+                decode = await _decode_payload_async(
                     page=self.page,
                     key_login=self.key_login,
                     secret_key=(
@@ -234,26 +389,28 @@ class DataAdmin:
                     ),
                     algorithms=self.secret_key.algorithm,
                 )
-            )
+            self._create_task_login_update(decode=decode)
         else:
             raise ValueError("Method not implemented in logout_init method.")
 
     def _create_login(self):
         """Create the connection between sessions."""
         if self.page.web:
-            self.page.pubsub.subscribe_topic(self.page.client_ip + self.page.client_user_agent, self.__logaut_init)
+            self.page.pubsub.subscribe_topic(self._sessions_topic, self.__logaut_init)
 
     def _create_tasks(self, time_expiry: timedelta, key: str, sleep: int) -> None:
         """Creates the logout task when logging in."""
         if time_expiry is not None:
-            Job(
-                func=self.logout,
-                key=key,
-                every=time_expiry,
-                page=self.page,
-                login_done=self._login_done_evaluate,
-                sleep_time=sleep,
-            ).start()
+            self.__start_job(
+                Job(
+                    func=self.logout,
+                    key=key,
+                    every=time_expiry,
+                    page=self.page,
+                    login_done=self._login_done_evaluate,
+                    sleep_time=sleep,
+                )
+            )
 
     def login(
         self,
@@ -271,7 +428,7 @@ class DataAdmin:
         * `value` : Recommend to use a dict if you use JWT.
         * `next_route` : Redirect to next route after creating login.
         * `time_expiry` : Time to expire the session, use the `timedelta` class  to configure. (Optional)
-        * `sleep` : Time to do login checks, default is 1s. (Optional)
+        * `sleep` : Kept for compatibility, the session now expires exactly at `time_expiry` without polling. (Optional)
         """
         if time_expiry:
             assert isinstance(value, Dict), "Use a dict in login method values or don't use time_expiry."
@@ -279,11 +436,14 @@ class DataAdmin:
                 self.__secret_key is not None
             ), "Set the secret_key in the FletApp class parameter or don't use time_expiry."
 
+        self._invalidate_login()
+
         if self.__secret_key:
             evaluate_secret_key(self)
             self._key_login = key
-            self.__sleep = sleep
+            self.__login.sleep = sleep
             value = encode_verified(self.secret_key, value, time_expiry)
+            self._invalidate_token(key)
             self._login_done = True
 
             if self.__auto_logout:
@@ -292,10 +452,7 @@ class DataAdmin:
         self.page.run_task(self.page.client_storage.set_async, key, value).result()
 
         if self.page.web:
-            self.page.pubsub.send_others_on_topic(
-                self.page.client_ip + self.page.client_user_agent,
-                Msg("login", key, {"value": value, "next_route": next_route}),
-            )
+            self._send_others(self._sessions_topic, Msg("login", key, {"value": value, "next_route": next_route}))
         self.__go(next_route)
 
     """ Page go  """
@@ -304,6 +461,33 @@ class DataAdmin:
         """To change the application path, it is important for better validation to avoid using `page.go()`."""
         return lambda _=None: self.__go(route)
 
+    async def go_async(self, route: str):
+        """Change the application path from async code, awaiting the login, middleware and page of the route.
+
+        ### Example:
+        ```python
+        async def go_home(e):
+            await data.go_async("/home")
+        ```
+        """
+        await self.__go_async(route)
+
+    def prefetch(self, route: str):
+        """Builds the page of the route in the background while the current page is idle, so that going to it
+        only shows the already built `View`. Routes with `protected_route` or middlewares are not prefetched, since
+        their login and middlewares only run on navigation. The page is built with a copy of the `DataAdmin`
+        (and a new `data.view`), the current page is not modified; the login state is shared with the copy.
+
+        ### Example:
+        ```python
+        @app.page("/orders", title="Orders")
+        def orders_page(data: ui.DataAdmin):
+            data.prefetch("/orders/detail/1")
+            ...
+        ```
+        """
+        self.__prefetch(route)
+
     def redirect(self, route: str):
         """Useful if you do not want to access a route that has already been sent."""
         return Redirect(route)
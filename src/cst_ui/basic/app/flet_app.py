@@ -11,11 +11,18 @@ from typing import Any, Callable, Dict, List, Optional
 
 from flet import View
 
+from .cache import CacheInfo, SharedCache
 from .data_admin import DataAdmin
+from .limiter import LIMITER_MODES
+from .middleware import MiddlewareTiming
 from .my_types import Redirect
 from .my_types import SecretKey
 from .page_admin import AddPageAdmin, Middleware, PageAdmin
 from .route import auto_routing, FletAppX
+from .route_matcher import patterns_cache
+from .route_trie import RouteTrie
+from .session_sync import SessionSync
+from .timing import NavigationSink
 
 
 def page(
@@ -26,8 +33,12 @@ def page(
     protected_route: bool = False,
     custom_params: Dict[str, Any] = None,
     middleware: Middleware = None,
+    keep_alive: bool = False,
+    prefetch: List[str] = None,
 ):
-    return App.page(route, title, page_clear, share_data, protected_route, custom_params, middleware)
+    return App.page(
+        route, title, page_clear, share_data, protected_route, custom_params, middleware, keep_alive, prefetch
+    )
 
 
 class App:
@@ -39,9 +50,22 @@ class App:
     * `route_login` : The route that will be redirected when the app has route protectionconfigured.
     * `on_Keyboard` : Enables the on_Keyboard event, by default it is disabled (False).
     * `on_resize` : Triggers the on_resize event, by default it is disabled (False).
+    * `resize_mode` : How the functions of `data.on_resize.add_control` follow the resize events: `'debounce'` (once the size settles), `'throttle'` (at most once per `resize_interval`) or `None` (every event), by default is `'debounce'`.
+    * `resize_interval` : Seconds of the `resize_mode` window, by default is 0.1.
+    * `share_max_bytes` : Memory limit (estimated bytes) of `data.share` per session, the least recently used values are removed when it is exceeded, by default there is no limit.
+    * `shared_cache_size` : Maximum number of keys of `App.shared_cache` (LRU), by default is 256.
+    * `shared_cache_ttl` : Default seconds that the values of `App.shared_cache` are valid, by default they do not expire.
     * `secret_key` : Used with `SecretKey` class of Flet easy, to configure JWT or client storage.
     * `auto_logout` : If you use JWT, you can configure it.
     * `path_views` : Configuration of the folder where are the .py files of the pages, you use the `Path` class to configure it.
+    * `lazy_views` : Used with `path_views`, the modules of the pages are imported the first time their route is visited, by default it is disabled (False).
+    * `manifest_cache` : Used with `lazy_views`, file where the route manifest is stored, so that only the modified files of `path_views` are scanned on the next start.
+    * `view_cache_size` : Maximum number of `View` kept per session for the pages with `keep_alive` (LRU), by default is 16. The limit counts `View`s, not bytes. The cache is emptied on login and logout.
+    * `navigation_sink` : Function that receives a `NavigationRecord` with the timing of each navigation (match, login, middleware, view, update, did_mount), `NavigationStats` keeps p50/p95/p99 per route.
+    * `history_depth` : Maximum number of routes kept in `history_routes` and of `View` kept in `page.views`, useful for sessions that run for a long time, by default there is no limit.
+    * `route_cache_size` : Maximum number of compiled route patterns kept in memory (LRU, shared by all sessions), by default is 512.
+    * `login_cache_ttl` : Seconds that a successful result of the `login` decorator is reused by the protected routes of a session, `DataAdmin.login` and `DataAdmin.logout` discard it, by default it is not cached.
+    * `session_sync_window` : Seconds that the login / logout messages between the tabs of a client are held to send them coalesced, `None` sends them right away, by default is 0.05.
 
     Example:
     ```python
@@ -129,6 +153,19 @@ class App:
         secret_key: SecretKey = None,
         auto_logout: bool = False,
         path_views: Path = None,
+        lazy_views: bool = False,
+        manifest_cache: Path = None,
+        view_cache_size: int = 16,
+        navigation_sink: NavigationSink = None,
+        history_depth: int = None,
+        route_cache_size: int = 512,
+        login_cache_ttl: float = None,
+        session_sync_window: float = 0.05,
+        resize_mode: str = "debounce",
+        resize_interval: float = 0.1,
+        share_max_bytes: int = None,
+        shared_cache_size: int = 256,
+        shared_cache_ttl: float = None,
     ):
         self.__route_prefix = route_prefix
         self.__route_init = route_init
@@ -137,6 +174,19 @@ class App:
         self.__on_Keyboard = on_Keyboard
         self.__secret_key = secret_key
         self.__auto_logout = auto_logout
+        self.__view_cache_size = view_cache_size
+        self.__navigation_sink = navigation_sink
+        assert history_depth is None or history_depth > 0, "The 'history_depth' of the app must be greater than 0."
+        self.__history_depth = history_depth
+        assert login_cache_ttl is None or login_cache_ttl > 0, "The 'login_cache_ttl' of the app must be greater than 0."
+        self.__login_cache_ttl = login_cache_ttl
+        self.__session_sync = SessionSync(session_sync_window)
+        assert resize_mode is None or resize_mode in LIMITER_MODES, f"The 'resize_mode' must be one of {LIMITER_MODES}."
+        self.__resize_mode = resize_mode
+        self.__resize_interval = resize_interval
+        assert share_max_bytes is None or share_max_bytes > 0, "The 'share_max_bytes' of the app must be greater than 0."
+        self.__share_max_bytes = share_max_bytes
+        self.__shared_cache = SharedCache(shared_cache_size, shared_cache_ttl)
         self.__config_login: Callable[[DataAdmin], View] = None
         # ----
         self.__pages = deque()
@@ -145,10 +195,41 @@ class App:
         self.__view_config: Callable[[DataAdmin], None] = None
         self.__config_event: Callable[[DataAdmin], None] = None
         self.__middlewares: Middleware = None
+        self.__middleware_timings: Dict[Callable, MiddlewareTiming] = {}
         App.__self = self
+        patterns_cache.resize(route_cache_size)
 
         if path_views is not None:
-            self.add_pages(auto_routing(path_views))
+            self.add_pages(auto_routing(path_views, lazy=lazy_views, cache_file=manifest_cache))
+
+    @property
+    def shared_cache(self) -> SharedCache:
+        """Thread-safe, single-flight cache shared by all the sessions of the app (also `data.shared_cache`),
+        so reference data is loaded once instead of once per session.
+
+        Example:
+        ```python
+        @app.page("/form")
+        async def form_page(data: fs.DataAdmin):
+            options = await data.shared_cache.get_or_load_async("units", load_units, ttl=600)
+        ```
+        """
+        return self.__shared_cache
+
+    @staticmethod
+    def route_cache_info() -> CacheInfo:
+        """Hits, misses and evictions of the compiled route patterns cache, useful to size `route_cache_size`."""
+        return patterns_cache.info()
+
+    def middleware_timings(self) -> Dict[str, MiddlewareTiming]:
+        """Calls, redirects and seconds spent in each middleware, shared by all sessions of the app.
+
+        Example:
+        ```python
+        app.middleware_timings()  # -> {"check_user": MiddlewareTiming(name="check_user", calls=10, redirects=1, total=0.02)}
+        ```
+        """
+        return {timing.name: timing for timing in self.__middleware_timings.values()}
 
     # -------------------------------------------------------------------
     # -- initialize / Supports async
@@ -168,6 +249,12 @@ class App:
     ) -> Page:
         """* Execute the app. | Soporta async, fastapi y export_asgi_app."""
 
+        # The routes are compiled once and shared by every session of the app.
+        routes = RouteTrie(self.__pages)
+        # The middlewares of each page are composed once, instead of on every navigation.
+        for page_admin in self.__pages:
+            page_admin.compile_middleware(self.__middlewares, self.__middleware_timings)
+
         def main(page: Page):
             app = FletAppX(
                 page=page,
@@ -185,6 +272,17 @@ class App:
                 secret_key=self.__secret_key,
                 auto_logout=self.__auto_logout,
                 middleware=self.__middlewares,
+                routes=routes,
+                view_cache_size=self.__view_cache_size,
+                navigation_sink=self.__navigation_sink,
+                history_depth=self.__history_depth,
+                login_cache_ttl=self.__login_cache_ttl,
+                middleware_timings=self.__middleware_timings,
+                session_sync=self.__session_sync,
+                resize_interval=self.__resize_interval,
+                resize_mode=self.__resize_mode,
+                share_max_bytes=self.__share_max_bytes,
+                shared_cache=self.__shared_cache,
             )
 
             app.run()
@@ -237,6 +335,8 @@ class App:
                         protected_route=data.get("protected_route"),
                         custom_params=data.get("custom_params"),
                         middleware=data.get("middleware"),
+                        keep_alive=data.get("keep_alive"),
+                        prefetch=data.get("prefetch"),
                     )
                 )
             return wrapper
@@ -271,6 +371,8 @@ class App:
         protected_route: bool = False,
         custom_params: Dict[str, Any] = None,
         middleware: Middleware = None,
+        keep_alive: bool = False,
+        prefetch: List[str] = None,
     ):
         """Decorator to add a new page to the app, you need the following parameters:
         * route: text string of the url, for example(`'/FletApp'`).
@@ -280,6 +382,8 @@ class App:
         * protected_route: Protects the route of the page, according to the configuration of the `login` decorator of the `FletApp` class. (optional)
         * custom_params: To add validation of parameters in the custom url using a list, where the key is the name of the parameter validation and the value is the custom function that must report a boolean value.
         * `middleware` : It acts as an intermediary between different software components, intercepting and processing requests and responses. They allow adding functionalities to an application in a flexible and modular way. (optional)
+        * `keep_alive` : Reuses the built `View` when returning to the page, instead of building it again. (optional)
+        * `prefetch` : Routes that are usually visited after this page, their `View` is built in the background once this page is shown. Routes with `protected_route` or middlewares are not prefetched. (optional)
 
         -> The decorated function must receive a parameter, for example `data:fs.DataAdmin`.
 
@@ -313,6 +417,8 @@ class App:
             "protected_route": protected_route,
             "custom_params": custom_params,
             "middleware": middleware,
+            "keep_alive": keep_alive,
+            "prefetch": prefetch,
         }
         return cls.__decorator(cls.__self, "page", data)
 
@@ -1,6 +1,11 @@
+import contextlib
 import traceback
+from collections import OrderedDict, deque
+from contextvars import ContextVar
+from sys import getsizeof
+from threading import RLock
 from inspect import iscoroutinefunction
-from typing import Any, Callable, Dict, List, TypeVar
+from typing import Any, Callable, Dict, FrozenSet, Hashable, List, Optional, Tuple, TypeVar
 
 from flet import (
     Control,
@@ -12,43 +17,239 @@ from flet import (
     alignment,
 )
 from flet.canvas import Canvas
-from flet.controls.session_storage import SessionStorage
+
+from .limiter import RateLimiter
 
 # T = TypeVar("T")
 
 
-class SessionStorageEdit(SessionStorage):
-    def __init__(self):
-        self.__store: dict[str, Any] = {}
-        super().__init__()
+def estimate_size(value: Any, depth: int = 2) -> int:
+    """Approximate size in bytes of a shared value.
+
+    DataFrames (`memory_usage`) and arrays (`nbytes`) report their own size, the containers add the size of their
+    items up to `depth` levels.
+    """
+    memory_usage = getattr(value, "memory_usage", None)
+    if callable(memory_usage):
+        with contextlib.suppress(Exception):
+            usage = memory_usage(deep=True)
+            return int(usage.sum() if hasattr(usage, "sum") else usage)
+    nbytes = getattr(value, "nbytes", None)
+    if isinstance(nbytes, int):
+        return nbytes
+
+    size = getsizeof(value, 0)
+    if depth > 0:
+        if isinstance(value, dict):
+            size += sum(estimate_size(k, depth - 1) + estimate_size(v, depth - 1) for k, v in value.items())
+        elif isinstance(value, (list, tuple, set, frozenset, deque)):
+            size += sum(estimate_size(item, depth - 1) for item in value)
+        elif hasattr(value, "__dict__"):
+            size += estimate_size(vars(value), depth - 1)
+    return size
+
+
+class ShareSnapshot:
+    """Read-only copy of the values of `data.share`, created without copying them (copy-on-write)."""
+
+    __slots__ = ("_store", "_sizes", "nbytes")
+
+    def __init__(self, store: "OrderedDict[str, Any]", sizes: Dict[str, int], nbytes: int):
+        self._store = store
+        self._sizes = sizes
+        self.nbytes = nbytes
+
+    def __len__(self) -> int:
+        return len(self._store)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._store
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self._store.get(key, default)
+
+
+class SessionStorageEdit:
+    """Values shared between the pages of a session (`data.share`).
+
+    Each value is stored with an estimate of its size (`estimate_size`), when the session goes over `max_bytes`
+    the least recently used values are removed (the last value set is always kept). `snapshot` and `restore`
+    share the stored values, the store is only copied on the first change after a snapshot.
+
+    * `max_bytes` : Memory limit of the session, `None` means no limit.
+
+    Example:
+    ```python
+    data.share.set("df", df)
+    snapshot = data.share.snapshot()  # -> before leaving the page
+    data.share.restore(snapshot)  # -> back navigation, without querying again
+    ```
+    """
+
+    def __init__(self, max_bytes: Optional[int] = None):
+        assert max_bytes is None or max_bytes > 0, "The 'max_bytes' of the share must be greater than 0."
+        self.max_bytes = max_bytes
+        self.__lock = RLock()
+        self.__store: OrderedDict[str, Any] = OrderedDict()
+        self.__sizes: Dict[str, int] = {}
+        self.__nbytes = 0
+        # The store and the sizes belong to a snapshot, they are copied before the next change.
+        self.__shared = False
+
+    @property
+    def nbytes(self) -> int:
+        """Estimated bytes of all the values of the session."""
+        return self.__nbytes
+
+    def size_of(self, key: str) -> int:
+        """Estimated bytes of the value of the key (0 if it does not exist)."""
+        return self.__sizes.get(key, 0)
+
+    def __len__(self) -> int:
+        return len(self.__store)
+
+    def __own(self):
+        if self.__shared:
+            self.__store = OrderedDict(self.__store)
+            self.__sizes = dict(self.__sizes)
+            self.__shared = False
+
+    def set(self, key: str, value: Any):
+        size = estimate_size(value)
+        with self.__lock:
+            self.__own()
+            self.__nbytes += size - self.__sizes.get(key, 0)
+            self.__store[key] = value
+            self.__store.move_to_end(key)
+            self.__sizes[key] = size
+            if self.max_bytes is not None:
+                while self.__nbytes > self.max_bytes and len(self.__store) > 1:
+                    old_key, _ = self.__store.popitem(last=False)
+                    self.__nbytes -= self.__sizes.pop(old_key)
+
+    def get(self, key: str) -> Any:
+        with self.__lock:
+            if key not in self.__store:
+                return None
+            # Reading a value marks it as recently used, only when the store is not shared with a snapshot.
+            if not self.__shared:
+                self.__store.move_to_end(key)
+            return self.__store[key]
+
+    def contains_key(self, key: str) -> bool:
+        return key in self.__store
 
     def contains(self) -> bool:
         return len(self.__store) != 0
 
+    def get_keys(self) -> List[str]:
+        return list(self.__store.keys())
+
     def get_values(self) -> List[Any]:
         return list(self.__store.values())
 
     def get_all(self) -> Dict[str, Any]:
-        return self.__store
+        return dict(self.__store)
+
+    def remove(self, key: str):
+        with self.__lock:
+            if key in self.__store:
+                self.__own()
+                del self.__store[key]
+                self.__nbytes -= self.__sizes.pop(key)
 
     def delete(self, key: str):
-        super().remove(key)
+        self.remove(key)
+
+    def clear(self):
+        with self.__lock:
+            if len(self.__store) == 0:
+                return
+            self.__store = OrderedDict()
+            self.__sizes = {}
+            self.__nbytes = 0
+            self.__shared = False
+
+    def snapshot(self) -> ShareSnapshot:
+        """Saves the current values in O(1), they are not copied."""
+        with self.__lock:
+            self.__shared = True
+            return ShareSnapshot(self.__store, self.__sizes, self.__nbytes)
+
+    def restore(self, snapshot: ShareSnapshot):
+        """Replaces the values of the session with the ones of the snapshot in O(1)."""
+        with self.__lock:
+            self.__store = snapshot._store
+            self.__sizes = snapshot._sizes
+            self.__nbytes = snapshot.nbytes
+            self.__shared = True
 
     def __str__(self) -> str:
         show_str = ""
-        for _key, _value in self.__dict__.items():
-            show_str = show_str + "{_key}={_value}\n"
+        for _key, _value in self.__store.items():
+            show_str = show_str + f"{_key}={_value}\n"
         if show_str == "":
             show_str = "Share is Empty"
         return show_str
 
 
+# Scope of the bindings added while a `View` is being built (set by the router, also for the prefetched views).
+_binding_scope: ContextVar[Optional[Hashable]] = ContextVar("binding_scope", default=None)
+
+_MODIFIERS = {
+    "ctrl": "ctrl",
+    "control": "ctrl",
+    "shift": "shift",
+    "alt": "alt",
+    "option": "alt",
+    "meta": "meta",
+    "cmd": "meta",
+    "command": "meta",
+    "win": "meta",
+}
+
+Shortcut = Tuple[str, FrozenSet[str]]
+
+
+def parse_shortcut(shortcut: str) -> Shortcut:
+    """Converts `'Ctrl+Shift+S'` into the `(key, modifiers)` index of `KeyboardAdmin`, `'Ctrl++'` binds the `+` key."""
+    parts = shortcut.split("+")
+    if shortcut.endswith("++"):
+        parts = parts[:-2] + ["+"]
+    *modifiers, key = [part.strip() for part in parts]
+    try:
+        modifiers = frozenset(_MODIFIERS[modifier.lower()] for modifier in modifiers)
+    except KeyError as e:
+        raise ValueError(f"Unrecognized modifier in the shortcut '{shortcut}': {e}")
+    if key == "":
+        raise ValueError(f"The shortcut '{shortcut}' has no key.")
+    return key.lower(), modifiers
+
+
+Bindings = Dict[Optional[Hashable], List[Callable]]
+
+
+def _active_functions(bindings: Bindings, scope: Optional[Hashable]) -> List[Callable]:
+    """The global functions and the ones of the `View` shown."""
+    functions = list(bindings.get(None, ()))
+    if scope is not None:
+        functions.extend(bindings.get(scope, ()))
+    return functions
+
+
+def _drop_scopes(bindings: Bindings, keep: Callable[[Hashable], bool]):
+    for scope in [value for value in bindings if value is not None and not keep(value)]:
+        del bindings[scope]
+
+
 class KeyboardAdmin:
     """
     Class that manages the input of values by keyboard, contains the following methods:
 
     ```python
     add_control(function: Callable) # Add a controller configuration (method of a class or function), which is executed with the 'on_keyboard_event' event.
+    add_shortcut(shortcut: str, function: Callable) # Executes the function only when the combination is pressed, e.g. 'Ctrl+S'.
+    remove_shortcut(shortcut: str, function: Callable = None) # Removes the functions of the combination.
     key() # returns the value entered by keyboard.
     shift() # returns the value entered by keyboard.
     ctrl() # returns the value entered by keyboard.
@@ -56,11 +257,19 @@ class KeyboardAdmin:
     meta() # returns keyboard input.
     test() #returns a message of all keyboard input values (key, Shift, Control, Alt, Meta).
     ```
+
+    The functions added while a page builds its `View` belong to that `View`: they only run while it is shown and
+    are dropped when it is built again or leaves the history (the `keep_alive` views keep them). The ones added
+    outside of a page (e.g. in `config_event_handler`) are global.
     """
 
     def __init__(self, call=None) -> None:
         self.__call: KeyboardEvent = call
-        self.__controls: list = []
+        # scope -> functions executed with every key.
+        self.__controls: Bindings = {}
+        # (key, modifiers) -> scope -> functions.
+        self.__shortcuts: Dict[Shortcut, Bindings] = {}
+        self.__scope: Optional[Hashable] = None
 
     @property
     def call(self):
@@ -71,17 +280,71 @@ class KeyboardAdmin:
         self.__call = call
 
     def _controls(self) -> bool:
-        return len(self.__controls) != 0
+        return len(self.__controls) != 0 or len(self.__shortcuts) != 0
 
     def clear(self):
         self.__controls.clear()
+        self.__shortcuts.clear()
+
+    def __binding_scope(self) -> Optional[Hashable]:
+        scope = _binding_scope.get()
+        return scope if scope is not None else self.__scope
 
     def add_control(self, function: Callable):
         """Method to add functions to be executed by pressing a key `(supports async, if the app is one)`."""
-        self.__controls.append(function)
+        self.__controls.setdefault(self.__binding_scope(), []).append(function)
+
+    def add_shortcut(self, shortcut: str, function: Callable):
+        """Executes the function only when the key combination is pressed `(supports async, if the app is one)`.
+
+        Example:
+        ```python
+        data.on_keyboard_event.add_shortcut("Ctrl+S", save)
+        data.on_keyboard_event.add_shortcut("Escape", close_dialog)
+        ```
+        """
+        self.__shortcuts.setdefault(parse_shortcut(shortcut), {}).setdefault(self.__binding_scope(), []).append(function)
+
+    def remove_shortcut(self, shortcut: str, function: Callable = None):
+        """Removes a function of the key combination (or all of them) in every scope."""
+        index = parse_shortcut(shortcut)
+        scopes = self.__shortcuts.get(index)
+        if scopes is None:
+            return
+        for scope, functions in list(scopes.items()):
+            if function is not None:
+                functions[:] = [value for value in functions if value != function]
+            if function is None or len(functions) == 0:
+                del scopes[scope]
+        if len(scopes) == 0:
+            del self.__shortcuts[index]
+
+    def _enter_scope(self, scope: Hashable, keep: Callable[[Hashable], bool]):
+        """Shows the scope of a `View`, dropping the bindings of every other `View` for which `keep` is false."""
+        self.__scope = scope
+        for bindings in (self.__controls, *self.__shortcuts.values()):
+            _drop_scopes(bindings, keep)
+        for index in [index for index, scopes in self.__shortcuts.items() if len(scopes) == 0]:
+            del self.__shortcuts[index]
 
     async def _run_controls(self):
-        for value in self.__controls:
+        functions = _active_functions(self.__controls, self.__scope)
+        if self.__shortcuts:
+            modifiers = frozenset(
+                name
+                for name, pressed in (
+                    ("ctrl", self.call.ctrl),
+                    ("shift", self.call.shift),
+                    ("alt", self.call.alt),
+                    ("meta", self.call.meta),
+                )
+                if pressed
+            )
+            scopes = self.__shortcuts.get(((self.call.key or "").lower(), modifiers))
+            if scopes is not None:
+                functions.extend(_active_functions(scopes, self.__scope))
+
+        for value in functions:
             if iscoroutinefunction(value):
                 await value()
             else:
@@ -119,17 +382,25 @@ class ResizeAdmin:
     * `width_x()` : This method is similar to the previous one in terms of page width.
     * `margin_y` : Requires an integer value on the y-axis.
     * `margin_x` : Requires an integer value on the x-axis.
+    * `add_control()` : Adds a function executed when the size changes, once the size settles (`'debounce'`) or at most once per interval (`'throttle'`).
 
+    The sizes are always updated, only the functions are limited by `mode` and `interval` (seconds), `mode=None` runs them on every event.
+
+    ```python
+    data.on_resize.add_control(update_layout)
     ```
     """
 
-    def __init__(self, page: Page = None) -> None:
+    def __init__(self, page: Page = None, interval: float = 0.1, mode: str | None = "debounce") -> None:
         self.__page = page
         self.__height: float = page.height
         self.__width: float = page.width
         self.__margin_y: float | int = 0
         self.__margin_x: float | int = 0
         self.__e: ControlEvent = None
+        self.__controls: Bindings = {}
+        self.__scope: Optional[Hashable] = None
+        self.__limiter = RateLimiter(self.__run_controls, interval, mode) if mode is not None else None
 
     @property
     def page(self) -> Page:
@@ -145,6 +416,31 @@ class ResizeAdmin:
         self.__page = e.page
         self.__height = self.page.height - self.__margin_y
         self.__width = self.page.width - self.__margin_x
+        if self.__controls:
+            if self.__limiter is None:
+                self.__run_controls()
+            else:
+                self.__limiter()
+
+    def add_control(self, function: Callable):
+        """Adds a function executed when the size of the page changes `(supports async, if the app is one)`."""
+        scope = _binding_scope.get()
+        self.__controls.setdefault(scope if scope is not None else self.__scope, []).append(function)
+
+    def clear(self):
+        self.__controls.clear()
+
+    def _enter_scope(self, scope: Hashable, keep: Callable[[Hashable], bool]):
+        """Same as `KeyboardAdmin._enter_scope`."""
+        self.__scope = scope
+        _drop_scopes(self.__controls, keep)
+
+    def __run_controls(self):
+        for function in _active_functions(self.__controls, self.__scope):
+            if iscoroutinefunction(function):
+                self.__page.run_task(function)
+            else:
+                function()
 
     @property
     def margin_y(self):
@@ -202,7 +498,9 @@ class ResponsiveControl(Canvas):
     This class contains the following parameters:
     * `content: Control` -> Contains a control of flet.
     * `expand: int` -> To specify the space that will contain the `content` controller in the app, 1 equals the whole app.
-    * `resize_interval: int` -> To specify the response time (optional).
+    * `resize_interval: int` -> Milliseconds between the resize events of the canvas, also the window of `resize_mode`, by default is 100 (optional).
+      It was 1 before `resize_mode` existed: the events of a drag are now coalesced, use `resize_interval=1, resize_mode=None` to get every event.
+    * `resize_mode: str` -> `'debounce'` updates once the size settles, `'throttle'` at most once per `resize_interval`, `None` on every event (optional).
     * `on_resize: callable` -> Custom function to be executed when the app is resized (optional).
     * `show_resize: bool` -> To observe the size of the controller (width x height). is disabled when sending an `on_resize` function. (optional)
     * `show_resize_terminal: bool` -> To see the size of the controller (width x height) in the terminal. (optional)
@@ -229,7 +527,8 @@ class ResponsiveControl(Canvas):
         self,
         content: Control,
         expand: int,
-        resize_interval=1,
+        resize_interval=100,
+        resize_mode: str | None = "debounce",
         on_resize: Callable = None,
         show_resize: bool = False,
         show_resize_terminal: bool = False,
@@ -238,15 +537,28 @@ class ResponsiveControl(Canvas):
         super().__init__(**kwargs)
         self.content = content
         self.resize_interval = resize_interval
+        self.resize_mode = resize_mode
         self.resize_callback = on_resize
         self.expand = expand
         self.show_resize = show_resize
         self.show_resize_terminal = show_resize_terminal
         self.on_resize = self.__handle_canvas_resize
+        self.__limiter = (
+            RateLimiter(self.__apply_resize, resize_interval / 1000, resize_mode) if resize_mode is not None else None
+        )
 
     def __handle_canvas_resize(self, e):
+        if self.__limiter is None:
+            self.__apply_resize(e)
+        else:
+            self.__limiter(e)
+
+    def __apply_resize(self, e):
         if self.resize_callback:
-            self.resize_callback(e)
+            if iscoroutinefunction(self.resize_callback):
+                self.page.run_task(self.resize_callback, e)
+            else:
+                self.resize_callback(e)
         elif self.show_resize:
             if self.content.content:
                 self.content.content.value = f"{e.width} x {e.height}"
@@ -1,21 +1,46 @@
 import contextlib
+import json
+import os
+from asyncio import get_running_loop
+from collections import deque
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from pathlib import Path
 from secrets import token_bytes
-from typing import Any, Dict, Union
+from threading import Lock
+from typing import Any, Deque, Dict, List, Optional, Union
 
 with contextlib.suppress(ImportError):
     from jwt import DecodeError, ExpiredSignatureError, InvalidKeyError
 
 with contextlib.suppress(ImportError):
-    from rsa import newkeys
+    from rsa import PrivateKey, PublicKey, newkeys
 
 from .data_admin import DataAdmin, evaluate_secret_key
 from .my_types import Msg
-from .my_types import _decode_payload_async
+from .my_types import _decode_token
+
+# RSA prime search is pure python, the keys are generated outside of the event loop in this worker.
+_key_executor: Optional[ThreadPoolExecutor] = None
+_key_lock = Lock()
+
+
+def _default_executor() -> ThreadPoolExecutor:
+    global _key_executor
+    with _key_lock:
+        if _key_executor is None:
+            _key_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="AppKey")
+        return _key_executor
 
 
 class AppKey:
     """To obtain a `secret_key` more easily, support algorithms [ HS256, RS256 ]
 
+    The RSA keys are only generated the first time they are used, `generate_async` generates them in an executor
+    and `KeyPool` keeps keys generated in advance, so the start of the app does not block on the prime search.
+
+    * `public_key` : Existing public key (`rsa.PublicKey` or PEM), optional.
+    * `private_key` : Existing private key (`rsa.PrivateKey` or PEM), the public key is derived from it if missing.
+
     ### Example:
     ```python
     import flet_app as fs
@@ -28,13 +53,52 @@ class AppKey:
     # --- RS256
     PRIVATE_KEY = key.private_key()
     PUBLIC_KEY = key.public_key()
+
+    # --- RS256 without blocking the event loop
+    key = await fs.AppKey.generate_async()
     ```
     """
 
-    def __init__(self):
-        (public_key, private_key) = newkeys(2048)
-        self.public = public_key
-        self.private = private_key
+    def __init__(
+        self,
+        public_key: Union["PublicKey", str, None] = None,
+        private_key: Union["PrivateKey", str, None] = None,
+        nbits: int = 2048,
+    ):
+        if isinstance(private_key, str):
+            private_key = PrivateKey.load_pkcs1(private_key.encode("utf-8"))
+        if isinstance(public_key, str):
+            public_key = PublicKey.load_pkcs1(public_key.encode("utf-8"))
+        if public_key is None and private_key is not None:
+            public_key = PublicKey(private_key.n, private_key.e)
+
+        self.__public = public_key
+        self.__private = private_key
+        self.__nbits = nbits
+
+    @classmethod
+    async def generate_async(cls, nbits: int = 2048, executor: Optional[Executor] = None) -> "AppKey":
+        """Generates the RSA keys in an executor (a `ProcessPoolExecutor` can be used), without blocking the event loop."""
+        public_key, private_key = await get_running_loop().run_in_executor(
+            executor or _default_executor(), newkeys, nbits
+        )
+        return cls(public_key, private_key)
+
+    @property
+    def public(self) -> "PublicKey":
+        if self.__public is None:
+            self.__generate()
+        return self.__public
+
+    @property
+    def private(self) -> "PrivateKey":
+        if self.__private is None:
+            assert self.__public is None, "The AppKey only has the public key."
+            self.__generate()
+        return self.__private
+
+    def __generate(self):
+        self.__public, self.__private = newkeys(self.__nbits)
 
     def private_key(self) -> str:
         return self.private.save_pkcs1().decode("utf-8")
@@ -46,26 +110,130 @@ class AppKey:
         return token_bytes(64).hex().encode("utf-8")
 
 
+class KeyPool:
+    """RSA keys generated in advance in the background and persisted in a file, to use them at the start of the app.
+
+    Each `take` removes a key from the pool (it is never given twice) and generates a new one in the background.
+
+    * `path` : File where the private keys (PEM) are stored, it is written with `0o600` permissions.
+    * `size` : Number of keys kept ready, by default is 2.
+    * `nbits` : Size of the keys, by default is 2048.
+    * `executor` : Executor where the keys are generated, by default a single worker thread.
+
+    ### Example:
+    ```python
+    pool = fs.KeyPool(Path(".keys.json"))
+    key = pool.take()  # -> AppKey
+
+    app = fs.App(
+        secret_key=fs.SecretKey(
+            algorithm=fs.EncryptAlgorithm.RS256,
+            pem_key=fs.PemKey(private=key.private_key(), public=key.public_key()),
+        ),
+    )
+    ```
+    """
+
+    def __init__(self, path: Path, size: int = 2, nbits: int = 2048, executor: Optional[Executor] = None):
+        assert size > 0, "The 'size' of the KeyPool must be greater than 0."
+        self.path = Path(path)
+        self.size = size
+        self.nbits = nbits
+        self.__executor = executor
+        self.__lock = Lock()
+        self.__keys: Deque[str] = deque(self.__load())
+        self.__pending = 0
+
+    def __len__(self) -> int:
+        return len(self.__keys)
+
+    def take(self) -> AppKey:
+        """Returns a key of the pool, if it is empty the key is generated now (blocking)."""
+        private_pem = self.__pop()
+        if private_pem is None:
+            return AppKey(nbits=self.nbits)
+        return AppKey(private_key=private_pem)
+
+    async def take_async(self) -> AppKey:
+        """Same as `take`, but if the pool is empty the key is generated without blocking the event loop."""
+        private_pem = self.__pop()
+        if private_pem is None:
+            return await AppKey.generate_async(self.nbits, self.__executor)
+        return AppKey(private_key=private_pem)
+
+    def fill(self) -> List[Future]:
+        """Generates in the background the keys that are missing to reach `size`."""
+        with self.__lock:
+            missing = self.size - len(self.__keys) - self.__pending
+            self.__pending += max(missing, 0)
+        futures = []
+        for _ in range(missing):
+            future = (self.__executor or _default_executor()).submit(newkeys, self.nbits)
+            future.add_done_callback(self.__add)
+            futures.append(future)
+        return futures
+
+    def __pop(self) -> Optional[str]:
+        with self.__lock:
+            private_pem = self.__keys.popleft() if self.__keys else None
+            if private_pem is not None:
+                self.__save()
+        self.fill()
+        return private_pem
+
+    def __add(self, future: Future):
+        with self.__lock:
+            self.__pending -= 1
+            if future.cancelled() or future.exception() is not None:
+                return
+            _, private_key = future.result()
+            self.__keys.append(private_key.save_pkcs1().decode("utf-8"))
+            self.__save()
+
+    def __load(self) -> List[str]:
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return []
+        if data.get("nbits") != self.nbits:
+            return []
+        return list(data.get("keys", []))
+
+    def __save(self):
+        data = json.dumps({"nbits": self.nbits, "keys": list(self.__keys)})
+        tmp_file = self.path.with_name(self.path.name + ".tmp")
+        fd = os.open(tmp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w", encoding="utf-8") as file:
+            file.write(data)
+        os.replace(tmp_file, self.path)
+
+
 async def _handle_decode_errors(data: DataAdmin, key_login: str) -> Union[Dict[str, Any], bool]:
     """decodes the jwt and updates the browser sessions."""
     try:
         data._key_login = key_login
         evaluate_secret_key(data)
 
-        if not await data.page.client_storage.contains_key_async(key_login):
+        # The payload already verified in this session is reused until it expires (or the session logs out).
+        decode = data._cached_payload(key_login)
+        if decode is not None:
+            return decode
+
+        token = await data.page.client_storage.get_async(key_login)
+        if token is None:
             return False
 
         if data.auto_logout and not data._login_done:
-            data.page.pubsub.send_others_on_topic(data.page.client_ip, Msg("updateLogin", value=data._login_done))
+            data._send_others(data.page.client_ip, Msg("updateLogin", value=data._login_done))
 
-        decode = await _decode_payload_async(
-            page=data.page,
-            key_login=key_login,
+        decode = _decode_token(
+            token=token,
             secret_key=(
                 data.secret_key.secret if data.secret_key.secret is not None else data.secret_key.pem_key.public
             ),
             algorithms=data.secret_key.algorithm,
         )
+        data._cache_payload(key_login, decode)
 
         """ It checks if there is a logout time, if there is a logout task running and finally if the user wants to create a logout task. """
         if decode.get("exp") and not data._login_done and data.auto_logout:
@@ -0,0 +1,107 @@
+from threading import Lock, Timer
+from time import monotonic
+from typing import Any, Callable, Optional, Tuple
+
+LIMITER_MODES = ("debounce", "throttle")
+
+
+class RateLimiter:
+    """Limits how often a function runs when it is called in bursts (e.g. hundreds of resize events per second).
+
+    * `function` : Function that receives the arguments of the last call.
+    * `interval` : Seconds of the window.
+    * `mode` : `'debounce'` runs once the calls stop for `interval`, `'throttle'` runs at most once per `interval`.
+    * `leading` : Runs on the first call of a burst (default: only for `'throttle'`).
+    * `trailing` : Runs with the last call of a burst once the window ends (default: True).
+
+    A single timer thread is alive per burst, whatever the number of calls.
+
+    Example:
+    ```python
+    limiter = RateLimiter(update_layout, interval=0.1, mode="debounce")
+    page.on_resize = limiter
+    ```
+    """
+
+    def __init__(
+        self,
+        function: Callable[..., Any],
+        interval: float = 0.1,
+        mode: str = "debounce",
+        leading: Optional[bool] = None,
+        trailing: bool = True,
+    ):
+        assert mode in LIMITER_MODES, f"The 'mode' must be one of {LIMITER_MODES}."
+        assert interval >= 0, "The 'interval' must be greater than or equal to 0."
+        self.function = function
+        self.interval = interval
+        self.mode = mode
+        self.leading = mode == "throttle" if leading is None else leading
+        self.trailing = trailing
+        self.__lock = Lock()
+        self.__timer: Optional[Timer] = None
+        self.__deadline = 0.0
+        self.__last_run = float("-inf")
+        self.__pending: Optional[Tuple[tuple, dict]] = None
+
+    def __call__(self, *args, **kwargs):
+        now = monotonic()
+        run_now = False
+        with self.__lock:
+            if self.mode == "debounce":
+                run_now = self.leading and self.__timer is None
+                self.__deadline = now + self.interval
+            else:
+                run_now = self.leading and now - self.__last_run >= self.interval
+                if self.__timer is None:
+                    self.__deadline = (self.__last_run if self.leading and not run_now else now) + self.interval
+
+            if run_now:
+                self.__last_run = now
+                self.__pending = None
+            elif self.trailing:
+                self.__pending = (args, kwargs)
+
+            if self.__timer is None and (self.trailing or self.mode == "debounce"):
+                self.__start(self.__deadline - now)
+
+        if run_now:
+            self.function(*args, **kwargs)
+
+    def __start(self, delay: float):
+        self.__timer = Timer(max(delay, 0.0), self.__expire)
+        self.__timer.daemon = True
+        self.__timer.start()
+
+    def __expire(self):
+        with self.__lock:
+            remaining = self.__deadline - monotonic()
+            # The debounce window was extended by newer calls.
+            if remaining > 0:
+                self.__start(remaining)
+                return
+            self.__timer = None
+            pending, self.__pending = self.__pending, None
+            if pending is not None:
+                self.__last_run = monotonic()
+
+        if pending is not None:
+            self.function(*pending[0], **pending[1])
+
+    def flush(self):
+        """Runs the pending call now."""
+        with self.__lock:
+            if self.__timer is not None:
+                self.__timer.cancel()
+                self.__timer = None
+            pending, self.__pending = self.__pending, None
+        if pending is not None:
+            self.function(*pending[0], **pending[1])
+
+    def cancel(self):
+        """Discards the pending call."""
+        with self.__lock:
+            if self.__timer is not None:
+                self.__timer.cancel()
+                self.__timer = None
+            self.__pending = None
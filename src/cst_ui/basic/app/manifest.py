@@ -0,0 +1,320 @@
+import ast
+import json
+import os
+from dataclasses import asdict, dataclass
+from hashlib import sha1
+from importlib.util import module_from_spec, spec_from_file_location
+from inspect import getmembers
+from pathlib import Path
+from threading import RLock
+from types import ModuleType
+from typing import Any, Dict, List, Optional
+
+from .page_admin import AddPageAdmin, PageAdmin, ViewHandler
+
+# Same order as the parameters of `AddPageAdmin.page`.
+PAGE_ARGUMENTS = (
+    "route",
+    "title",
+    "page_clear",
+    "share_data",
+    "protected_route",
+    "custom_params",
+    "middleware",
+    "keep_alive",
+    "prefetch",
+)
+# Arguments that are usually not literals (functions), the file is imported when they are used.
+EAGER_ARGUMENTS = ("custom_params", "middleware")
+
+# 2: files that use an `AddPageAdmin` other than through `@x.page(...)` are imported.
+# 3: files with a `page` decorator that is not `@x.page(...)` of a known object (e.g. `@page("/x")`) are imported.
+MANIFEST_VERSION = 3
+
+_modules: Dict[str, ModuleType] = {}
+_modules_lock = RLock()
+
+
+def load_module(file: Path) -> ModuleType:
+    """Imports the .py file of the pages only once."""
+    key = str(file)
+    with _modules_lock:
+        module = _modules.get(key)
+        if module is None:
+            spec = spec_from_file_location(file.stem, file)
+            module = module_from_spec(spec)
+            spec.loader.exec_module(module)
+            _modules[key] = module
+    return module
+
+
+@dataclass
+class RouteEntry:
+    """A page found in the route manifest, without importing its module."""
+
+    route: str
+    title: str = None
+    page_clear: bool = False
+    share_data: bool = False
+    protected_route: bool = False
+    keep_alive: bool = False
+    prefetch: List[str] = None
+    module_path: str = None
+    function_name: str = None
+
+
+class LazyView:
+    """Page function that is imported the first time its route is visited."""
+
+    def __init__(self, module_path: str, function_name: str):
+        self.module_path = module_path
+        self.function_name = function_name
+
+    def load(self) -> ViewHandler:
+        module = load_module(Path(self.module_path))
+        for _, object_page in getmembers(module):
+            if isinstance(object_page, AddPageAdmin):
+                for page in object_page.pages:
+                    if getattr(page.view, "__name__", None) == self.function_name:
+                        return page.view
+        return getattr(module, self.function_name)
+
+    def __repr__(self) -> str:
+        return f"LazyView({self.module_path}:{self.function_name})"
+
+
+def _is_add_page_admin(node: ast.AST) -> bool:
+    if not isinstance(node, ast.Call):
+        return False
+    func = node.func
+    return (isinstance(func, ast.Name) and func.id == "AddPageAdmin") or (
+        isinstance(func, ast.Attribute) and func.attr == "AddPageAdmin"
+    )
+
+
+def _literal(node: ast.AST) -> Any:
+    """`ast.literal_eval` that raises `ValueError` for anything that is not a literal."""
+    try:
+        return ast.literal_eval(node)
+    except (ValueError, TypeError, SyntaxError, MemoryError, RecursionError):
+        raise ValueError("Not a literal.")
+
+
+def _decorator_name(decorator: ast.expr) -> Optional[str]:
+    """Name of the function of a decorator: `page` for `@page`, `@x.page` and `@x.page(...)`."""
+    function = decorator.func if isinstance(decorator, ast.Call) else decorator
+    if isinstance(function, ast.Name):
+        return function.id
+    if isinstance(function, ast.Attribute):
+        return function.attr
+    return None
+
+
+def scan_file(file: Path, source: Optional[str] = None) -> Optional[List[RouteEntry]]:
+    """Finds the `@x.page(...)` decorators of the `AddPageAdmin` objects of a file with a lightweight AST scan.
+
+    Returns `None` when the file can not be described without importing it (non-literal arguments,
+    `custom_params` or `middleware`, any `page` decorator that is not `@x.page(...)` of a known object, e.g. a bare
+    `@page("/x")`, an `AddPageAdmin` used in any other way than a top-level `@x.page(...)` decorator, e.g.
+    `users.page("/detail")(detail_page)`...).
+    """
+    try:
+        tree = ast.parse(source if source is not None else file.read_text(encoding="utf-8"), str(file))
+    except SyntaxError:
+        return None
+
+    prefixes: Dict[str, Optional[str]] = {}
+    entries: List[RouteEntry] = []
+    # `Name` nodes of the `AddPageAdmin` objects that the scan understands (assignment and decorators).
+    known_uses: set[int] = set()
+    try:
+        for node in tree.body:
+            if isinstance(node, (ast.Assign, ast.AnnAssign)) and _is_add_page_admin(node.value):
+                targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+                call = node.value
+                prefix_node = call.args[0] if call.args else None
+                for keyword in call.keywords:
+                    if keyword.arg == "route_prefix":
+                        prefix_node = keyword.value
+                prefix = _literal(prefix_node) if prefix_node is not None else None
+                for target in targets:
+                    if not isinstance(target, ast.Name):
+                        return None
+                    prefixes[target.id] = prefix
+                    known_uses.add(id(target))
+
+            if not isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+                continue
+
+            for decorator in node.decorator_list:
+                if _decorator_name(decorator) != "page":
+                    continue
+                # `@page(...)`, `@x.page` or `@module.x.page(...)` can not be linked to a known `AddPageAdmin`.
+                if not (
+                    isinstance(decorator, ast.Call)
+                    and isinstance(decorator.func, ast.Attribute)
+                    and isinstance(decorator.func.value, ast.Name)
+                    and decorator.func.value.id in prefixes
+                ):
+                    return None
+                known_uses.add(id(decorator.func.value))
+
+                arguments = dict(zip(PAGE_ARGUMENTS, decorator.args))
+                arguments.update({keyword.arg: keyword.value for keyword in decorator.keywords})
+                values = {name: _literal(value) for name, value in arguments.items()}
+                if any(values.get(name) is not None for name in EAGER_ARGUMENTS) or "route" not in values:
+                    return None
+
+                route_prefix = prefixes[decorator.func.value.id]
+                route = values["route"]
+                entries.append(
+                    RouteEntry(
+                        route=(route_prefix if route == "/" else route_prefix + route) if route_prefix else route,
+                        title=values.get("title"),
+                        page_clear=bool(values.get("page_clear", False)),
+                        share_data=bool(values.get("share_data", False)),
+                        protected_route=bool(values.get("protected_route", False)),
+                        keep_alive=bool(values.get("keep_alive", False)),
+                        prefetch=values.get("prefetch"),
+                        module_path=str(file),
+                        function_name=node.name,
+                    )
+                )
+    except ValueError:
+        return None
+
+    # Any other use could register pages (or change the object) at import time.
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Name) and node.id in prefixes and id(node) not in known_uses:
+            return None
+
+    return entries
+
+
+def entries_to_pages(entries: List[RouteEntry]) -> AddPageAdmin:
+    """Builds an `AddPageAdmin` whose pages import their module on the first visit."""
+    group = AddPageAdmin()
+    for entry in entries:
+        group.pages.append(
+            PageAdmin(
+                route=entry.route,
+                view=LazyView(entry.module_path, entry.function_name),
+                title=entry.title,
+                clear=entry.page_clear,
+                share_data=entry.share_data,
+                protected_route=entry.protected_route,
+                keep_alive=entry.keep_alive,
+                prefetch=entry.prefetch,
+            )
+        )
+    return group
+
+
+class ManifestCache:
+    """Persists the route manifest of `auto_routing(..., lazy=True)` in a json file.
+
+    Each file of `path_views` is stored with its mtime, size and sha1, so on the next start the unchanged files
+    are not scanned again and only the modified ones are parsed.
+
+    Example:
+    ```python
+    app = ui.App(path_views=Path("views"), lazy_views=True, manifest_cache=Path(".routes.json"))
+    ```
+    """
+
+    def __init__(self, cache_file: Path, file_dir: Path):
+        self.cache_file = Path(cache_file)
+        self.file_dir = Path(file_dir)
+        self.__files: Dict[str, Dict[str, Any]] = {}
+        self.__seen: set[str] = set()
+        self.__changed = False
+        self.load()
+
+    def load(self):
+        """Reads the manifest, a missing, corrupt or foreign file is ignored (the files are scanned again)."""
+        try:
+            data = json.loads(self.cache_file.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        if not isinstance(data, dict):
+            return
+        if data.get("version") != MANIFEST_VERSION or data.get("file_dir") != str(self.file_dir.resolve()):
+            return
+        files = data.get("files")
+        if isinstance(files, dict):
+            self.__files = {key: record for key, record in files.items() if self.__valid_record(record)}
+
+    @staticmethod
+    def __valid_record(record: Any) -> bool:
+        """Shape of the record of a file, the invalid ones are scanned again."""
+        if not isinstance(record, dict):
+            return False
+        if not all(isinstance(record.get(name), int) for name in ("mtime_ns", "size")):
+            return False
+        if not isinstance(record.get("sha1"), str):
+            return False
+        entries = record.get("entries", False)
+        if entries is None:
+            return True
+        if not isinstance(entries, list):
+            return False
+        for entry in entries:
+            if not isinstance(entry, dict) or "module_path" in entry or not isinstance(entry.get("route"), str):
+                return False
+            try:
+                RouteEntry(**entry)
+            except TypeError:
+                return False
+        return True
+
+    def save(self):
+        """Writes the manifest if it changed, removing the files that no longer exist."""
+        for key in set(self.__files) - self.__seen:
+            del self.__files[key]
+            self.__changed = True
+        if not self.__changed:
+            return
+
+        data = {"version": MANIFEST_VERSION, "file_dir": str(self.file_dir.resolve()), "files": self.__files}
+        tmp_file = self.cache_file.with_name(self.cache_file.name + ".tmp")
+        tmp_file.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp_file, self.cache_file)
+        self.__changed = False
+
+    def scan(self, file: Path) -> Optional[List[RouteEntry]]:
+        """Same as `scan_file`, but reuses the cached entries if the file did not change."""
+        key = file.relative_to(self.file_dir).as_posix()
+        self.__seen.add(key)
+        stat = file.stat()
+        record = self.__files.get(key)
+
+        if record is not None and record["mtime_ns"] == stat.st_mtime_ns and record["size"] == stat.st_size:
+            return self.__entries(record, file)
+
+        source = file.read_bytes()
+        digest = sha1(source).hexdigest()
+        if record is not None and record["sha1"] == digest:
+            record.update(mtime_ns=stat.st_mtime_ns, size=stat.st_size)
+            self.__changed = True
+            return self.__entries(record, file)
+
+        entries = scan_file(file, source.decode("utf-8"))
+        self.__files[key] = {
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "sha1": digest,
+            # `None` means that the file must be imported to know its pages.
+            "entries": (
+                None
+                if entries is None
+                else [{k: v for k, v in asdict(entry).items() if k != "module_path"} for entry in entries]
+            ),
+        }
+        self.__changed = True
+        return entries
+
+    @staticmethod
+    def __entries(record: Dict[str, Any], file: Path) -> Optional[List[RouteEntry]]:
+        if record["entries"] is None:
+            return None
+        return [RouteEntry(**entry, module_path=str(file)) for entry in record["entries"]]
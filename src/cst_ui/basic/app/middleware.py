@@ -0,0 +1,118 @@
+from asyncio import get_running_loop
+from contextvars import copy_context
+from dataclasses import dataclass
+from functools import partial
+from inspect import iscoroutinefunction
+from time import perf_counter
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from .my_types import Redirect
+from .timing import NavigationTimer
+
+MIDDLEWARE_ERROR = (
+    "Ocurrió un error en una función middleware. Usa los métodos para redirigir (data.redirect) o devolver False."
+)
+
+
+@dataclass
+class MiddlewareTiming:
+    """Counters of a middleware, shared by every page and session that runs it.
+
+    * `name` : Name of the middleware function.
+    * `calls` : Number of times it was executed.
+    * `redirects` : Number of times it returned a `Redirect`.
+    * `total` : Seconds spent in the middleware.
+    """
+
+    name: str
+    calls: int = 0
+    redirects: int = 0
+    total: float = 0.0
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.calls if self.calls else 0.0
+
+
+def _check(result: Any) -> Optional[Redirect]:
+    """`None` (or a truthy value) continues the chain, a `Redirect` stops it and any other falsy value is an error."""
+    if result is None or isinstance(result, Redirect):
+        return result
+    if not result:
+        raise Exception(MIDDLEWARE_ERROR)
+    return None
+
+
+def _run_sync_steps(steps: Tuple[Tuple[Callable, MiddlewareTiming], ...], data: Any) -> Tuple[List[float], Any]:
+    """Runs consecutive sync middlewares in a single executor call, it stops at the first `Redirect`."""
+    elapsed: List[float] = []
+    for handler, _ in steps:
+        start = perf_counter()
+        result = handler(data)
+        elapsed.append(perf_counter() - start)
+        if _check(result) is not None:
+            return elapsed, result
+    return elapsed, None
+
+
+class MiddlewareChain:
+    """The global and page middlewares of a `PageAdmin`, composed once when the app starts.
+
+    Whether each middleware is sync or async is resolved here, and consecutive sync middlewares are grouped so the
+    whole group costs a single executor call per navigation.
+
+    * `middlewares` : The middlewares in execution order (global first, then the ones of the page).
+    * `timings` : Registry of `MiddlewareTiming` shared by the chains of the app, keyed by middleware.
+    """
+
+    __slots__ = ("groups", "timings")
+
+    def __init__(
+        self,
+        middlewares: Iterable[Callable],
+        timings: Optional[Dict[Callable, MiddlewareTiming]] = None,
+    ):
+        self.timings = timings if timings is not None else {}
+        # Each group is `(is_async, ((handler, timing), ...))`.
+        self.groups: List[Tuple[bool, Tuple[Tuple[Callable, MiddlewareTiming], ...]]] = []
+        for middleware in middlewares:
+            timing = self.timings.get(middleware)
+            if timing is None:
+                timing = self.timings.setdefault(
+                    middleware, MiddlewareTiming(getattr(middleware, "__name__", repr(middleware)))
+                )
+            is_async = iscoroutinefunction(middleware)
+            if not is_async and self.groups and not self.groups[-1][0]:
+                self.groups[-1] = (False, self.groups[-1][1] + ((middleware, timing),))
+            else:
+                self.groups.append((is_async, ((middleware, timing),)))
+
+    def __len__(self) -> int:
+        return sum(len(steps) for _, steps in self.groups)
+
+    async def run(self, data: Any, timer: Optional[NavigationTimer] = None) -> Optional[Redirect]:
+        """Runs the middlewares with the `DataAdmin` of the navigation, returns the first `Redirect` or `None`."""
+        for is_async, steps in self.groups:
+            if is_async:
+                handler, timing = steps[0]
+                start = perf_counter()
+                result = await handler(data)
+                elapsed = [perf_counter() - start]
+            else:
+                # The context is copied so that the middlewares see the context variables of the navigation.
+                elapsed, result = await get_running_loop().run_in_executor(
+                    None, copy_context().run, partial(_run_sync_steps, steps, data)
+                )
+
+            # The counters are only updated on the event loop.
+            for (handler, timing), seconds in zip(steps, elapsed):
+                timing.calls += 1
+                timing.total += seconds
+                if timer is not None:
+                    timer.add(f"middleware:{timing.name}", seconds)
+
+            redirect = _check(result)
+            if redirect is not None:
+                steps[len(elapsed) - 1][1].redirects += 1
+                return redirect
+        return None
@@ -3,7 +3,11 @@ from typing import Union
 import contextlib
 from datetime import datetime, timezone, timedelta
 from typing import Any, Dict, Optional
-from asyncio import sleep
+from asyncio import AbstractEventLoop, TimerHandle, get_running_loop, sleep
+from heapq import heapify, heappop, heappush
+from itertools import count
+from time import time
+from weakref import WeakKeyDictionary
 from typing import Callable
 from flet import Page
 
@@ -11,14 +15,14 @@ with contextlib.suppress(ImportError):
     from jwt import decode, encode
 
 from re import Pattern, compile
-from typing import Callable, Dict, Optional, Tuple
+from typing import Callable, Dict, List, Optional, Tuple
 
 
 @dataclass
 class Msg:
     method: str
     key: str = None
-    value: Union[str, dict] = None
+    value: Union[str, dict, list] = None
 
 
 @dataclass
@@ -102,19 +106,97 @@ def encode_verified(secret_key: SecretKey, value: str, time_expiration) -> Optio
         Exception("Algorithm not implemented in encode_verified method.")
 
 
-async def _decode_payload_async(page: Page, key_login: str, secret_key: str, algorithms: str) -> Dict[str, Any]:
-    """Decodes the payload stored in the client storage."""
+def _decode_token(token: str, secret_key: str, algorithms: str) -> Dict[str, Any]:
+    """Verifies the signature of the jwt and decodes its payload."""
     assert secret_key is not None, "The secret_key algorithm is not supported, only (RS256, HS256) is accepted."
 
     return decode(
-        jwt=await page.client_storage.get_async(key_login),
+        jwt=token,
         key=secret_key,
         algorithms=[algorithms],
     )
 
 
+async def _decode_payload_async(page: Page, key_login: str, secret_key: str, algorithms: str) -> Dict[str, Any]:
+    """Decodes the payload stored in the client storage."""
+    return _decode_token(await page.client_storage.get_async(key_login), secret_key, algorithms)
+
+
+class ExpiryScheduler:
+    """Heap of the `Job` expirations of an event loop.
+
+    A single timer of the loop is armed for the nearest expiration, so the idle cost does not depend on the number
+    of logged in sessions. It must be used from the thread of its event loop (`Job.start` takes care of it).
+    """
+
+    __schedulers: "WeakKeyDictionary[AbstractEventLoop, ExpiryScheduler]" = WeakKeyDictionary()
+
+    def __init__(self, loop: AbstractEventLoop):
+        self.__loop = loop
+        self.__heap: List[Tuple[float, int, "Job"]] = []
+        self.__counter = count()
+        self.__handle: TimerHandle | None = None
+        self.__cancelled = 0
+
+    @classmethod
+    def get(cls, loop: AbstractEventLoop | None = None) -> "ExpiryScheduler":
+        """Returns the scheduler of the loop (the running loop by default)."""
+        loop = loop or get_running_loop()
+        scheduler = cls.__schedulers.get(loop)
+        if scheduler is None:
+            scheduler = cls.__schedulers[loop] = cls(loop)
+        return scheduler
+
+    def __len__(self) -> int:
+        return len(self.__heap) - self.__cancelled
+
+    def add(self, job: "Job"):
+        heappush(self.__heap, (job.next_run_time.timestamp(), next(self.__counter), job))
+        self.__arm()
+
+    def cancel_threadsafe(self, job: "Job"):
+        self.__loop.call_soon_threadsafe(self.cancel, job)
+
+    def cancel(self, job: "Job"):
+        """Cancelled jobs are removed lazily, the heap is rebuilt when most of it is cancelled."""
+        if job.cancelled:
+            return
+        job.cancelled = True
+        self.__cancelled += 1
+        if self.__cancelled > len(self.__heap) // 2:
+            self.__heap = [entry for entry in self.__heap if not entry[2].cancelled]
+            heapify(self.__heap)
+            self.__cancelled = 0
+        self.__arm()
+
+    def __arm(self):
+        while self.__heap and self.__heap[0][2].cancelled:
+            heappop(self.__heap)
+            self.__cancelled -= 1
+
+        if self.__handle is not None:
+            self.__handle.cancel()
+            self.__handle = None
+        if self.__heap:
+            delay = max(0.0, self.__heap[0][0] - time())
+            self.__handle = self.__loop.call_later(delay, self.__fire)
+
+    def __fire(self):
+        self.__handle = None
+        now = time()
+        while self.__heap and self.__heap[0][0] <= now:
+            _, _, job = heappop(self.__heap)
+            if job.cancelled:
+                self.__cancelled -= 1
+                continue
+            job.cancelled = True
+            if job.task_running:
+                job._expire()
+        self.__arm()
+
+
 class Job:
-    """Create time-definite tasks"""
+    """Create time-definite tasks, the expiration is registered in the `ExpiryScheduler` of the event loop."""
 
     def __init__(
         self,
@@ -130,6 +212,8 @@ class Job:
         self.every = every
         self.sleep_time = sleep_time
         self.task_running = False
+        self.cancelled = False
+        self.__scheduler: ExpiryScheduler | None = None
         self.page = page
         self.login_done = login_done
         self.next_run_time = datetime.now() + self.every
@@ -145,10 +229,18 @@ class Job:
             self.page.run_task(self.run_task)
 
     async def run_task(self):
-        while datetime.now() <= self.next_run_time and self.login_done():
-            await sleep(self.sleep_time)
+        """Registers the expiration of the job, `logout` runs exactly at `next_run_time`."""
+        if self.task_running:
+            self.__scheduler = ExpiryScheduler.get()
+            self.__scheduler.add(self)
+
+    def _expire(self):
+        self.task_running = False
         if self.login_done():
             self.func(self.key)()
 
     def stop(self):
+        """Cancels the job (logout or disconnection of the session)."""
         self.task_running = False
+        if self.__scheduler is not None:
+            self.__scheduler.cancel_threadsafe(self)
@@ -1,12 +1,14 @@
 from collections import deque
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from functools import wraps
 from typing import Any, Callable, Dict, List, Optional
 
 from flet import View
 
 from .data_admin import DataAdmin
+from .middleware import MiddlewareChain, MiddlewareTiming
 from .my_types import Redirect
+from .route_matcher import RouteMatcher
 
 MiddlewareHandler = Callable[[DataAdmin], Optional[Redirect]]
 Middleware = List[MiddlewareHandler]
@@ -24,6 +26,8 @@ class PageAdmin:
     * `protected_route`: Protects the route of the page, according to the configuration of the `login` decorator of the `FletApp` class. (optional)
     * `custom_params`: To add validation of parameters in the custom url using a list, where the key is the name of the parameter validation and the value is the custom function that must report a boolean value.
     * `middleware` : It acts as an intermediary between different software components, intercepting and processing requests and responses. They allow adding functionalities to an application in a flexible and modular way. (optional)
+    * `keep_alive` : Keeps the built `View` of the page (per route and url parameters), returning to the page reuses it instead of building it again. (optional)
+    * `prefetch` : Routes whose `View` is built in the background once this page is shown. (optional)
 
     Example:
     ```python
@@ -39,6 +43,41 @@ class PageAdmin:
     protected_route: bool = False
     custom_params: Dict[str, Callable[[], bool]] = None
     middleware: Middleware = None
+    keep_alive: bool = False
+    prefetch: List[str] = None
+    _matcher: Optional[RouteMatcher] = field(default=None, init=False, repr=False, compare=False)
+    _chain: Optional[MiddlewareChain] = field(default=None, init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        if self.route is not None:
+            self.compile()
+
+    def __setattr__(self, name: str, value: Any):
+        super().__setattr__(name, value)
+        # The compiled matcher is only rebuilt when the route (or its custom types) changes.
+        if name in ("route", "custom_params"):
+            super().__setattr__("_matcher", None)
+        elif name == "middleware":
+            super().__setattr__("_chain", None)
+
+    def compile(self) -> RouteMatcher:
+        """Builds and stores the `RouteMatcher` of the current `route`."""
+        self._matcher = RouteMatcher(self.route, self.custom_params)
+        return self._matcher
+
+    @property
+    def matcher(self) -> RouteMatcher:
+        """The compiled `RouteMatcher` of `route` (regex, ordered `(name, parser)` tuples and custom validators)."""
+        return self._matcher if self._matcher is not None else self.compile()
+
+    def compile_middleware(
+        self,
+        middleware: Optional[Middleware] = None,
+        timings: Optional[Dict[Callable, MiddlewareTiming]] = None,
+    ) -> MiddlewareChain:
+        """Composes the global `middleware` of the app and the `middleware` of the page into a `MiddlewareChain`."""
+        self._chain = MiddlewareChain([*(middleware or ()), *(self.middleware or ())], timings)
+        return self._chain
 
 
 class AddPageAdmin:
@@ -115,6 +154,8 @@ class AddPageAdmin:
                     protected_route=data.get("protected_route"),
                     custom_params=data.get("custom_params"),
                     middleware=data.get("middleware"),
+                    keep_alive=data.get("keep_alive"),
+                    prefetch=data.get("prefetch"),
                 )
             )
             return wrapper
@@ -130,6 +171,8 @@ class AddPageAdmin:
         protected_route: bool = False,
         custom_params: Dict[str, Any] = None,
         middleware: Middleware = None,
+        keep_alive: bool = False,
+        prefetch: List[str] = None,
     ):
         """Decorator to add a new page to the app, you need the following parameters:
         * route: text string of the url, for example(`'/counter'`).
@@ -139,6 +182,8 @@ class AddPageAdmin:
         * protected_route: Protects the route of the page, according to the configuration of the `login` decorator of the `FletApp` class. (optional)
         * custom_params: To add validation of parameters in the custom url using a list, where the key is the name of the parameter validation and the value is the custom function that must report a boolean value.
         * `middleware` : It acts as an intermediary between different software components, intercepting and processing requests and responses. They allow adding functionalities to an application in a flexible and modular way. (optional)
+        * `keep_alive` : Reuses the built `View` when returning to the page, instead of building it again. (optional)
+        * `prefetch` : Routes that are usually visited after this page, their `View` is built in the background once this page is shown. Routes with `protected_route` or middlewares are not prefetched. (optional)
 
         -> The decorated function must receive a parameter, for example `data:fs.DataAdmin`.
 
@@ -175,6 +220,8 @@ class AddPageAdmin:
             "protected_route": protected_route,
             "custom_params": custom_params,
             "middleware": middleware,
+            "keep_alive": keep_alive,
+            "prefetch": prefetch,
         }
         return self.__decorator(data)
 
@@ -185,4 +232,5 @@ class AddPageAdmin:
                     page.route = route
                 else:
                     page.route = route + page.route
+                page.compile()
         return self.pages
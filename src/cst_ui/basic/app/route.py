@@ -1,46 +1,69 @@
-import re
-from re import Pattern, compile, escape
-from typing import Any, Callable, Dict, List, Optional, Tuple
+from asyncio import get_running_loop
+from collections import deque
+from contextvars import copy_context
+from copy import copy
+from functools import partial
+from sys import intern
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple
 from inspect import iscoroutinefunction
 
 from flet import ControlEvent, KeyboardEvent, Page, RouteChangeEvent, View
 
 # from parse import parse
 
+from .cache import LRUCache, SharedCache
 from .data_admin import DataAdmin
-from .my_types import TYPE_PATTERNS, Msg, Redirect
-from .inheritance import KeyboardAdmin, ResizeAdmin
+from .middleware import MiddlewareTiming
+from .my_types import Msg
+from .inheritance import KeyboardAdmin, ResizeAdmin, _binding_scope
 from .page_admin import Middleware, PageAdmin
+from .route_matcher import RouteMatcher
+from .route_trie import RouteTrie
+from .session_sync import SessionSync
+from .timing import NavigationSink, NavigationTimer
 from .view_404 import page_404_common
 
 
 from importlib.util import module_from_spec, spec_from_file_location
 from inspect import getmembers
 from pathlib import Path
+from .manifest import LazyView, ManifestCache, entries_to_pages, scan_file
 from .page_admin import AddPageAdmin
 
 
-def auto_routing(file_dir: Path) -> List[AddPageAdmin]:
+def auto_routing(file_dir: Path, lazy: bool = False, cache_file: Path = None) -> List[AddPageAdmin]:
     """
     A function that automatically routes through a directory to find Python files, extract AddPageAdmin objects, and return a list of them.
 
     Parameters:
     - dir (str): The directory path to search for Python files.
+    - lazy (bool): Only scan the `@x.page(...)` decorators of the files, the module of a page is imported the first time its route is visited. Files that can not be scanned (e.g. `middleware` or `custom_params` in the decorator) are imported as usual.
+    - cache_file (Path): Used with `lazy`, persists the route manifest so that unchanged files are not scanned on the next start.
 
     Returns:
     - List[AddPageAdmin]: A list of AddPageAdmin objects found in the specified directory.
     """
 
     pages = []
+    manifest = ManifestCache(cache_file, file_dir) if lazy and cache_file is not None else None
     # for file in file_dir.rglob('*.py[c]'):
     for file in file_dir.rglob('*.py'):
         if file.name != "__init__.py":
+            if lazy:
+                entries = scan_file(file) if manifest is None else manifest.scan(file)
+                if entries is not None:
+                    if len(entries) != 0:
+                        pages.append(entries_to_pages(entries))
+                    continue
+
             spec = spec_from_file_location(file.stem, file)
             module = module_from_spec(spec)
             spec.loader.exec_module(module)
             for _, object_page in getmembers(module):
                 if isinstance(object_page, AddPageAdmin):
                     pages.append(object_page)
+    if manifest is not None:
+        manifest.save()
     if len(pages) == 0:
         raise ValueError(
             "No instances of AddPageAdmin found. Check the assigned path of the 'path_views' parameter of the class (App)."
@@ -50,8 +73,6 @@ def auto_routing(file_dir: Path) -> List[AddPageAdmin]:
 
 
 class FletAppX:
-    __compiled_patterns_cache: Dict[str, re.Pattern[str]] = {}
-
     def __init__(
         self,
         page: Page,
@@ -69,10 +90,21 @@ class FletAppX:
         secret_key: str,
         auto_logout: bool,
         middleware: Middleware,
+        routes: RouteTrie = None,
+        view_cache_size: int = 16,
+        navigation_sink: NavigationSink = None,
+        history_depth: int = None,
+        login_cache_ttl: float = None,
+        middleware_timings: Dict[Callable, MiddlewareTiming] = None,
+        session_sync: SessionSync = None,
+        resize_interval: float = 0.1,
+        resize_mode: str = "debounce",
+        share_max_bytes: int = None,
+        shared_cache: SharedCache = None,
     ):
         self.__page = page
         self.__page_on_keyboard = KeyboardAdmin()
-        self.__page_on_resize = ResizeAdmin(self.__page)
+        self.__page_on_resize = ResizeAdmin(self.__page, resize_interval, resize_mode)
 
         self.__route_init = route_init
         self.__route_login = route_login
@@ -80,14 +112,22 @@ class FletAppX:
         self.__on_resize = on_resize
         self.__on_Keyboard = on_Keyboard
         self.__middlewares = middleware
+        self.__middleware_timings = middleware_timings if middleware_timings is not None else {}
         # ----
         self.__pages = pages
+        self.__routes = routes if routes is not None else RouteTrie(pages)
         self.__view_404 = page_404_common
         self.__page_404 = page_404
         self.__view_data = view_data
         self.__view_config = view_config
         self.__config_event = config_event_handler
         self.__page_admin: PageAdmin | None = None
+        self.__view_cache = LRUCache(maxsize=view_cache_size)
+        self.__prefetched = LRUCache(maxsize=8)
+        self.__timer = NavigationTimer(navigation_sink)
+        self.__history_depth = history_depth
+        # Number of `page.views` entries added by each of the last navigations (placeholder + `View`).
+        self.__navigation_views: Deque[int] = deque(maxlen=history_depth)
 
         self.__data = DataAdmin(
             page=self.__page,
@@ -100,26 +140,34 @@ class FletAppX:
             page_on_resize=self.__page_on_resize,
             login_async=iscoroutinefunction(self.__config_login),
             go=self._go,
+            go_async=self._go_async,
+            view_cache=self.__view_cache,
+            prefetch=self._prefetch,
+            prefetched=self.__prefetched,
+            history_depth=history_depth,
+            login_cache_ttl=login_cache_ttl,
+            session_sync=session_sync,
+            share_max_bytes=share_max_bytes,
+            shared_cache=shared_cache,
         )
-        self.__data.view = self.__view_data_config() if self.__view_data is not None else None
         if self.__route_login is not None:
             self.__data._create_login()
 
     # ----------- Supports async
-    def __route_change(self, e: RouteChangeEvent):
+    async def __route_change(self, e: RouteChangeEvent):
         if self.__page_admin is None:
             if e.route == "/" and self.__route_init != "/":
                 return self.__page.go(self.__route_init)
 
-            self._go(e.route, True)
+            await self._go_async(e.route, True)
         else:
-            self._view_append(e.route, self.__page_admin)
-            self.__page_admin = None
+            page_admin, self.__page_admin = self.__page_admin, None
+            await self._view_append_async(e.route, page_admin)
 
-    def __view_pop(self, e):
+    async def __view_pop(self, e):
         if len(self.__data.history_routes) > 1:
             self.__data.history_routes.pop()
-            self._go(self.__data.history_routes.pop())
+            await self._go_async(self.__data.history_routes.pop())
 
     async def __on_keyboard(self, e: KeyboardEvent):
         self.__page_on_keyboard.call = e
@@ -129,23 +177,18 @@ class FletAppX:
     def __page_resize(self, e: ControlEvent):
         self.__page_on_resize.e = e
 
-    def __add_configuration_start(self):
+    async def __add_configuration_start(self):
         """Add general settings to the pages."""
         if self.__view_config:
-            if iscoroutinefunction(self.__view_config):
-                self.__page.run_task(self.__view_config, self.__page).result()
-            else:
-                self.__view_config(self.__page)
+            await self.__call_handler(self.__view_config, self.__page)
 
         if self.__config_event:
-            if iscoroutinefunction(self.__config_event):
-                self.__page.run_task(self.__config_event, self.__data).result()
-            else:
-                self.__config_event(self.__data)
+            await self.__call_handler(self.__config_event, self.__data)
 
     def __disconnect(self, e):
+        self.__data._cancel_jobs()
         if self.__data._login_done and self.__page.web:
-            self.__page.pubsub.send_others_on_topic(
+            self.__data._send_others(
                 self.__page.client_ip,
                 Msg("updateLoginSessions", value=self.__data._login_done),
             )
@@ -156,8 +199,12 @@ class FletAppX:
         if self.__route_init != "/" and self.__page.route == "/":
             self.__page.route = self.__route_init
 
-        """ Add custom events """
-        self.__add_configuration_start()
+        self.__run_sync(self.__run_async)
+
+    async def __run_async(self):
+        """ Add the `View` configuration and custom events """
+        await self.__view_data_config()
+        await self.__add_configuration_start()
 
         """ Executing charter events """
         self.__page.on_route_change = self.__route_change
@@ -171,46 +218,157 @@ class FletAppX:
         if self.__on_Keyboard:
             self.__page.on_keyboard_event = self.__on_keyboard
 
-        self._go(self.__page.route, use_reload=True)
+        await self._go_async(self.__page.route, use_reload=True)
 
     # ---------------------------[Route controller]-------------------------------------
-    def __view_data_config(self):
+    def __run_sync(self, handler: Callable[..., Awaitable[Any]], *args):
+        """Runs a coroutine of the navigation pipeline from synchronous code.
+
+        From a worker thread it waits for the result, on the event loop (async event handlers) it is only scheduled,
+        since blocking the loop would never let the coroutine run.
+        """
+        try:
+            get_running_loop()
+        except RuntimeError:
+            return self.__page.run_task(handler, *args).result()
+        return self.__page.run_task(handler, *args)
+
+    async def __call_handler(self, handler: Callable, *args, **kwargs):
+        """Awaits async handlers directly on the event loop, sync ones run in the executor (keeping the context) as flet does with events."""
+        if iscoroutinefunction(handler):
+            return await handler(*args, **kwargs)
+        return await get_running_loop().run_in_executor(None, copy_context().run, partial(handler, *args, **kwargs))
+
+    async def __view_data_config(self):
         """Add the `View` configuration, to reuse on every page."""
-        if iscoroutinefunction(self.__view_data):
-            return self.__page.run_task(self.__view_data, self.__data).result()
-        else:
-            return self.__view_data(self.__data)
+        if self.__view_data is not None:
+            self.__data.view = await self.__call_handler(self.__view_data, self.__data)
 
     def _view_append(self, route: str, page_admin: PageAdmin):
+        """Add a new page and update it."""
+        return self.__run_sync(self._view_append_async, route, page_admin)
+
+    async def _view_append_async(self, route: str, page_admin: PageAdmin):
         """Add a new page and update it."""
         # 更新至 flet 0.28.2 后，无论去什么route，都会重定向到routee_init
         # self.__page.views.clear()
 
+        added_views = 1
         if not page_admin.clear and len(self.__data.history_routes) > 0:
             self.__page.views.append(View())
-
-        if callable(page_admin.view) and not isinstance(page_admin.view, type):
-            view = (
-                self.__page.run_task(page_admin.view, self.__data, **self.__data.url_params).result()
-                if iscoroutinefunction(page_admin.view)
-                else page_admin.view(self.__data, **self.__data.url_params)
-            )
-        elif isinstance(page_admin.view, type):
-            view_class = page_admin.view(self.__data, **self.__data.url_params)
-            view = (
-                self.__page.run_task(view_class.build).result()
-                if iscoroutinefunction(view_class.build)
-                else view_class.build()
-            )
-        view.route = route
-        self.__page.views.append(view)
-        self.__data.history_routes.append(route)
-        self.__page.update()
-
-        # 为 class 形式的添加 did_mount
-        if isinstance(page_admin.view, type):
-            if hasattr(view_class, 'did_mount'):
-                view_class.did_mount()
+            added_views += 1
+
+        self.__timer.start(route)
+        try:
+            cache_key = (page_admin.route, tuple(self.__data.url_params.items())) if page_admin.keep_alive else None
+            cached = self.__view_cache.get(cache_key) if cache_key is not None else None
+            with self.__timer.phase("view"):
+                if cached is not None:
+                    view, view_class = cached
+                    # A `View` can not be twice in the stack, the cached one is moved to the top.
+                    for index, stacked_view in enumerate(self.__page.views):
+                        if stacked_view is view:
+                            del self.__page.views[index]
+                            break
+                else:
+                    view, view_class = await self.__take_prefetched(page_admin, self.__data.url_params)
+                    if cache_key is not None:
+                        self.__view_cache.set(cache_key, (view, view_class))
+
+            view.route = route
+            self.__page.views.append(view)
+            # The history is a bounded deque, the repeated routes share the same (interned) string.
+            self.__data.history_routes.append(intern(route))
+            # The views are trimmed by navigation, the same `history_depth` as `history_routes`.
+            if self.__history_depth is not None:
+                self.__navigation_views.append(added_views)
+                kept_views = sum(self.__navigation_views)
+                if len(self.__page.views) > kept_views:
+                    del self.__page.views[:-kept_views]
+            with self.__timer.phase("update"):
+                self.__page.update()
+
+            # 为 class 形式的添加 did_mount
+            if view_class is not None and hasattr(view_class, "did_mount"):
+                with self.__timer.phase("did_mount"):
+                    await self.__call_handler(view_class.did_mount)
+
+            is_404 = page_admin is self.__page_404 or page_admin.view is self.__view_404
+            self.__timer.finish(None if is_404 else page_admin.route)
+        finally:
+            # The record of a navigation that raised is dropped, after `finish` there is nothing left to drop.
+            self.__timer.discard()
+
+        for prefetch_route in page_admin.prefetch or ():
+            await self._prefetch_async(prefetch_route)
+
+    def _prefetch(self, route: str):
+        """Builds the `View` of the route in the background, the next navigation to it uses that `View`."""
+        return self.__page.run_task(self._prefetch_async, route)
+
+    async def _prefetch_async(self, route: str):
+        resolved = self.__routes.resolve(route)
+        if resolved is None:
+            return
+
+        page_admin, url_params = resolved
+        # The login and the middlewares only run on navigation, a page guarded by them is never built ahead.
+        if page_admin.protected_route:
+            return
+        chain = page_admin._chain
+        if chain is None:
+            chain = page_admin.compile_middleware(self.__middlewares, self.__middleware_timings)
+        if len(chain) != 0:
+            return
+
+        cache_key = (page_admin.route, tuple(url_params.items()))
+        if cache_key in self.__prefetched or cache_key in self.__view_cache:
+            return
+
+        task = get_running_loop().create_task(self.__prefetch_view(page_admin, url_params))
+        # The error of a failed prefetch is raised again when the page is built on navigation.
+        task.add_done_callback(lambda task: task.cancelled() or task.exception())
+        self.__prefetched.set(cache_key, task)
+
+    async def __take_prefetched(self, page_admin: PageAdmin, url_params: Dict[str, Any]) -> Tuple[View, Any]:
+        """Returns the prefetched `View` of the page (waiting for it if it is still being built) or builds it."""
+        task = self.__prefetched.pop((page_admin.route, tuple(url_params.items())))
+        if task is not None:
+            try:
+                return await task
+            except Exception:
+                pass
+        return await self.__build_view(page_admin, url_params)
+
+    async def __prefetch_view(self, page_admin: PageAdmin, url_params: Dict[str, Any]) -> Tuple[View, Any]:
+        """Builds the page with its own `DataAdmin` copy and `view`, so the page being shown is never modified.
+        The copy shares the login state of the session, a `login()` / `logout()` called from the page is not lost."""
+        data = copy(self.__data)
+        data.url_params = url_params
+        data.route = page_admin.route
+        if self.__view_data is not None:
+            data.view = await self.__call_handler(self.__view_data, data)
+        return await self.__build_view(page_admin, url_params, data)
+
+    async def __build_view(
+        self, page_admin: PageAdmin, url_params: Dict[str, Any], data: Optional[DataAdmin] = None
+    ) -> Tuple[View, Any]:
+        """Calls the page function (or the class and its `build` method) of the page."""
+        if data is None:
+            data = self.__data
+        if isinstance(page_admin.view, LazyView):
+            page_admin.view = await get_running_loop().run_in_executor(None, page_admin.view.load)
+
+        # The key bindings added by the page belong to its `View`.
+        token = _binding_scope.set((page_admin.route, tuple(url_params.items())))
+        try:
+            if isinstance(page_admin.view, type):
+                view_class = await self.__call_handler(page_admin.view, data, **url_params)
+                return await self.__call_handler(view_class.build), view_class
+
+            return await self.__call_handler(page_admin.view, data, **url_params), None
+        finally:
+            _binding_scope.reset(token)
 
     def __reload_data_admin(
         self,
@@ -222,62 +380,49 @@ class FletAppX:
 
         if not page_admin.share_data:
             self.__data.share.clear()
-        if self.__on_Keyboard:
-            self.__data.on_keyboard_event.clear()
+        # The key / resize bindings of the `View` being left are dropped, unless it is kept alive or prefetched.
+        def keep(scope) -> bool:
+            return scope in self.__view_cache or scope in self.__prefetched
+
+        scope = (page_admin.route, tuple(url_params.items()))
+        self.__page_on_keyboard._enter_scope(scope, keep)
+        self.__page_on_resize._enter_scope(scope, keep)
 
         self.__data.url_params = url_params
         self.__data.route = page_admin.route
 
-    def __execute_middleware(self, page_admin: PageAdmin, url_params: Dict[str, Any], middleware_list: Middleware):
-        if middleware_list is None:
-            return False
-
-        for middleware in middleware_list:
-            self.__reload_data_admin(page_admin, url_params)
-            res_middleware = (
-                self.__page.run_task(middleware, self.__data).result()
-                if iscoroutinefunction(middleware)
-                else middleware(self.__data)
-            )
-            if res_middleware is None:
-                continue
-
-            if isinstance(res_middleware, Redirect):
-                self._go(res_middleware.route)
-                return True
-
-            if not res_middleware:
-                raise Exception(
-                    "Ocurrió un error en una función middleware. Usa los métodos para redirigir (data.redirect) o devolver False."
-                )
-
-    def __run_middlewares(
+    async def __run_middlewares(
         self,
         route: str,
-        middleware: Middleware,
         url_params: Dict[str, Any],
         page_admin: PageAdmin,
         use_route_change: bool,
         use_reload: bool,
     ):
         """Controla los middleware de la aplicación en general y en cada una de las páginas."""
+        chain = page_admin._chain
+        if chain is None:
+            chain = page_admin.compile_middleware(self.__middlewares, self.__middleware_timings)
 
-        if self.__execute_middleware(page_admin, url_params, middleware):
-            return True
+        self.__reload_data_admin(page_admin, url_params)
+        if len(chain) != 0:
+            redirect = await chain.run(self.__data, self.__timer)
+            if redirect is not None:
+                await self._go_async(redirect.route)
+                return True
 
-        if self.__execute_middleware(page_admin, url_params, page_admin.middleware):
-            return True
+        await self.__show_page(route, page_admin, use_route_change, use_reload)
 
-        self.__reload_data_admin(page_admin, url_params)
+        return True
+
+    async def __show_page(self, route: str, page_admin: PageAdmin, use_route_change: bool, use_reload: bool):
         if use_route_change:
-            self._view_append(route, page_admin)
+            await self._view_append_async(route, page_admin)
         else:
             if self.__page.route != route or use_reload:
                 self.__page_admin = page_admin
             self.__page.go(route)
 
-        return True
-
     # def __process_route(self, custom_params: Dict[str, Callable[[], bool]], path: str, route: str):
     #     if custom_params is None:
     #         route_math = parse(route, path)
@@ -299,58 +444,46 @@ class FletAppX:
     #             )
 
     def _go(self, route: str, use_route_change: bool = False, use_reload: bool = False):
-        pg_404 = True
-
-        for page in self.__pages:
-            route_math = self._verify_url(page.route, route, page.custom_params)
-            if route_math is not None:
-                pg_404 = False
-                try:
-                    if page.protected_route:
-                        assert (
-                            self.__route_login is not None
-                        ), "Configure the route of the login page, in the Flet-Easy class in the parameter (route_login)"
-
-                        if iscoroutinefunction(self.__config_login):
-                            try:
-                                auth = self.__page.run_task(self.__config_login, self.__data).result()
-                            except Exception as e:
-                                raise Exception(
-                                    "Use async methods in the function decorated by 'login', to avoid conflicts.",
-                                    e,
-                                )
-                        else:
-                            auth = self.__config_login(self.__data)
-
-                        if auth:
-                            self.__reload_data_admin(page, route_math)
-
-                            if use_route_change:
-                                self._view_append(route, page)
-
-                            else:
-                                if self.__page.route != route or use_reload:
-                                    self.__page_admin = page
-                                self.__page.go(route)
-
-                        else:
-                            self._go(self.__route_login)
-
-                        break
+        """Synchronous wrapper of `_go_async`."""
+        return self.__run_sync(self._go_async, route, use_route_change, use_reload)
+
+    async def _go_async(self, route: str, use_route_change: bool = False, use_reload: bool = False):
+        self.__timer.start(route)
+        with self.__timer.phase("match"):
+            resolved = self.__routes.resolve(route)
+
+        if resolved is not None:
+            page, route_math = resolved
+            try:
+                if page.protected_route:
+                    assert (
+                        self.__route_login is not None
+                    ), "Configure the route of the login page, in the Flet-Easy class in the parameter (route_login)"
+
+                    with self.__timer.phase("login"):
+                        auth = self.__data._cached_login()
+                        if auth is None:
+                            auth = await self.__call_handler(self.__config_login, self.__data)
+                            self.__data._cache_login(auth)
+
+                    if auth:
+                        self.__reload_data_admin(page, route_math)
+                        await self.__show_page(route, page, use_route_change, use_reload)
                     else:
-                        if self.__run_middlewares(
-                            route=route,
-                            middleware=self.__middlewares,
-                            url_params=route_math,
-                            page_admin=page,
-                            use_route_change=use_route_change,
-                            use_reload=use_reload,
-                        ):
-                            break
-                except Exception as e:
-                    raise Exception(e)
-        if pg_404:
-            page = self.__page_404 or PageAdmin(route, self.__view_404, "Flet-Easy 404")
+                        await self._go_async(self.__route_login)
+                else:
+                    await self.__run_middlewares(
+                        route=route,
+                        url_params=route_math,
+                        page_admin=page,
+                        use_route_change=use_route_change,
+                        use_reload=use_reload,
+                    )
+            except Exception as e:
+                self.__timer.discard()
+                raise Exception(e)
+        else:
+            page = self.__page_404 or PageAdmin(None, self.__view_404, "Flet-Easy 404")
 
             if page.route is None:
                 page.route = route
@@ -358,19 +491,12 @@ class FletAppX:
             self.__reload_data_admin(page)
 
             if use_route_change:
-                self._view_append(page.route, page)
+                await self._view_append_async(page.route, page)
             else:
                 if self.__page.route != route or use_reload:
                     self.__page_admin = page
                 self.__page.go(page.route)
 
-    @classmethod
-    def __compile_pattern(cls, pattern_parts: list[str]) -> Pattern[str]:
-        pattern_key = "/".join(pattern_parts)
-        if pattern_key not in cls.__compiled_patterns_cache:
-            cls.__compiled_patterns_cache[pattern_key] = compile(f"^/{pattern_key}/?$")
-        return cls.__compiled_patterns_cache[pattern_key]
-
     @classmethod
     def _verify_url(
         cls,
@@ -378,38 +504,4 @@ class FletAppX:
         url: str,
         custom_types: Optional[Dict[str, Callable[[str], Optional[bool]]]] = None,
     ) -> Optional[Dict[str, Optional[bool]]]:
-        combined_patterns = {
-            **TYPE_PATTERNS,
-            **{k: (compile(r"[^/]+"), v) for k, v in (custom_types or {}).items()},
-        }
-
-        segments: list[Tuple[str, Callable[[str], Optional[bool]]]] = []
-        pattern_parts: list[str] = []
-        type_patterns: list[str] = []
-
-        for segment in url_pattern.strip("/").split("/"):
-            try:
-                if segment == "":
-                    continue
-
-                if segment[0] in "<{" and segment[-1] in ">}":
-                    name, type_ = segment[1:-1].split(":", 1) if ":" in segment else (segment[1:-1], "str")
-                    type_patterns.append(type_)
-                    regex_part, parser = combined_patterns[type_]
-                    pattern_parts.append(f"({regex_part.pattern})")
-                    segments.append((name, parser))
-                else:
-                    pattern_parts.append(escape(segment))
-            except KeyError as e:
-                raise ValueError(f"Unrecognized data type: {e}")
-        if custom_types and type_ not in custom_types:
-            raise ValueError(f"A custom data type is not being used: {custom_types.keys()}")
-
-        pattern = cls.__compile_pattern(pattern_parts)
-        match = pattern.fullmatch(url)
-        if not match:
-            return None
-
-        result = {name: parser(match.group(i + 1)) for i, (name, parser) in enumerate(segments)}
-
-        return None if None in result.values() else result
+        return RouteMatcher(url_pattern, custom_types).match(url)
@@ -0,0 +1,109 @@
+from re import Pattern, compile, escape
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .cache import LRUCache
+from .my_types import TYPE_PATTERNS
+
+Parser = Callable[[str], Any]
+Segment = Tuple[str, Optional[Tuple[Pattern[str], Parser]]]
+
+# Shared by every session of the process, its size is configured with `App(route_cache_size=...)`.
+patterns_cache = LRUCache(maxsize=512)
+
+
+def compile_pattern(pattern_parts: List[str]) -> Pattern[str]:
+    """Returns the compiled `^/.../?$` regex of the pattern parts, shared by every route with the same shape."""
+    pattern_key = "/".join(pattern_parts)
+    pattern = patterns_cache.get(pattern_key)
+    if pattern is None:
+        pattern = patterns_cache.set(pattern_key, compile(f"^/{pattern_key}/?$"))
+    return pattern
+
+
+def split_route(
+    route: str,
+    custom_types: Optional[Dict[str, Callable[[str], Optional[bool]]]] = None,
+) -> List[Segment]:
+    """Splits a route pattern (`'/user/{id:int}'`) into its segments.
+
+    Static segments are returned as `(text, None)` and typed parameters as `(name, (regex, parser))`.
+    """
+    combined_patterns = {
+        **TYPE_PATTERNS,
+        **{k: (compile(r"[^/]+"), v) for k, v in (custom_types or {}).items()},
+    }
+
+    segments: List[Segment] = []
+    type_names: List[str] = []
+    for segment in route.strip("/").split("/"):
+        if segment == "":
+            continue
+
+        if segment[0] in "<{" and segment[-1] in ">}":
+            name, type_ = segment[1:-1].split(":", 1) if ":" in segment else (segment[1:-1], "str")
+            try:
+                segments.append((name, combined_patterns[type_]))
+            except KeyError as e:
+                raise ValueError(f"Unrecognized data type: {e}")
+            type_names.append(type_)
+        else:
+            segments.append((segment, None))
+
+    if custom_types and not any(type_ in custom_types for type_ in type_names):
+        raise ValueError(f"A custom data type is not being used: {custom_types.keys()}")
+
+    return segments
+
+
+def split_url(url: str) -> Optional[List[str]]:
+    """Splits a url into segments, following the same rules as the `^/.../?$` route regex."""
+    if not url.startswith("/"):
+        return None
+
+    body = url[1:]
+    if body.endswith("/"):
+        body = body[:-1]
+    return body.split("/") if body else []
+
+
+class RouteMatcher:
+    """Compiled form of a route pattern, built once by `PageAdmin` and reused on every navigation.
+
+    * `route` : The route pattern it was compiled from.
+    * `segments` : The static and typed segments of the route, used by `RouteTrie`.
+    * `regex` : The `^/.../?$` regex of the whole route.
+    * `params` : Ordered `(name, parser)` tuples of the typed parameters.
+    * `validators` : The custom-type validators (`custom_params`) of the route.
+    """
+
+    __slots__ = ("route", "segments", "regex", "params", "validators", "__groups")
+
+    def __init__(
+        self,
+        route: str,
+        custom_types: Optional[Dict[str, Callable[[str], Optional[bool]]]] = None,
+    ):
+        self.route = route
+        self.validators = custom_types
+        self.segments = split_route(route, custom_types)
+        self.params: Tuple[Tuple[str, Parser], ...] = tuple(
+            (name, param[1]) for name, param in self.segments if param is not None
+        )
+        pattern_parts: List[str] = []
+        for text, param in self.segments:
+            if param is None:
+                pattern_parts.append(escape(text))
+            else:
+                pattern_parts.append(f"(?P<p{len(pattern_parts)}>{param[0].pattern})")
+        self.regex = compile_pattern(pattern_parts)
+        self.__groups = tuple(f"p{i}" for i, (_, param) in enumerate(self.segments) if param is not None)
+
+    def match(self, url: str) -> Optional[Dict[str, Any]]:
+        """Returns the parsed parameters of the url, or `None` if it does not match the route."""
+        match = self.regex.fullmatch(url)
+        if not match:
+            return None
+
+        result = {name: parser(match.group(group)) for group, (name, parser) in zip(self.__groups, self.params)}
+
+        return None if None in result.values() else result
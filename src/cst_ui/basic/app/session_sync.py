@@ -0,0 +1,88 @@
+from asyncio import sleep
+from collections import OrderedDict
+from concurrent.futures import Future
+from threading import Lock
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+
+from flet import Page
+
+from .my_types import Msg
+
+# `(msg, origins, pubsub)`: `origins` are the sessions that must not receive the msg (`None` -> every session).
+_Entry = Tuple[Msg, Optional[FrozenSet[str]], Any]
+
+
+def session_id(page: Page) -> str:
+    """Stable id of the session of the page, unlike `id(page)` it is never reused by another session."""
+    return page.session.id
+
+
+class SessionSync:
+    """Coalesces the session-sync `Msg` (login, logout, updateLoginSessions...) sent over `page.pubsub`.
+
+    The messages of a topic are collected for `window` seconds, repeated `(method, key)` pairs keep only the
+    last one and the rest are sent as a single `Msg("batch", value=[(msg, origins), ...])`. A topic with a
+    single pending message sends it as before. It is shared by every session of the `App`, the pending messages
+    are sent from the event loop of the page (`page.run_task`), like the rest of the pubsub messages.
+
+    * `window` : Seconds that the messages of a topic are held, `None` (or 0) sends them right away.
+    """
+
+    def __init__(self, window: Optional[float] = 0.05):
+        self.window = window
+        self.__lock = Lock()
+        self.__pending: Dict[str, "OrderedDict[Tuple[str, Any], _Entry]"] = {}
+        self.__flushes: Dict[str, Future] = {}
+
+    def send_all(self, page: Page, topic: str, msg: Msg):
+        """Same as `page.pubsub.send_all_on_topic`."""
+        if not self.window:
+            return page.pubsub.send_all_on_topic(topic, msg)
+        self.__queue(page, topic, msg, None)
+
+    def send_others(self, page: Page, topic: str, msg: Msg):
+        """Same as `page.pubsub.send_others_on_topic`."""
+        if not self.window:
+            return page.pubsub.send_others_on_topic(topic, msg)
+        self.__queue(page, topic, msg, frozenset((session_id(page),)))
+
+    def __queue(self, page: Page, topic: str, msg: Msg, origins: Optional[FrozenSet[str]]):
+        with self.__lock:
+            pending = self.__pending.setdefault(topic, OrderedDict())
+            previous = pending.pop((msg.method, msg.key), None)
+            if previous is not None and origins is not None:
+                # Each sender must still receive the message of the others.
+                origins = None if previous[1] is None else previous[1] | origins
+            pending[(msg.method, msg.key)] = (msg, origins, page.pubsub)
+
+            if topic not in self.__flushes:
+                self.__flushes[topic] = page.run_task(self.__flush_later, topic)
+
+    async def __flush_later(self, topic: str):
+        await sleep(self.window)
+        self.flush(topic)
+
+    def flush(self, topic: Optional[str] = None):
+        """Sends the pending messages of a topic (or of every topic) now."""
+        with self.__lock:
+            topics = list(self.__pending) if topic is None else [topic]
+            batches: List[Tuple[str, List[_Entry]]] = []
+            for name in topics:
+                scheduled = self.__flushes.pop(name, None)
+                if scheduled is not None:
+                    # The flush that is already running (this one) can not be cancelled.
+                    scheduled.cancel()
+                pending = self.__pending.pop(name, None)
+                if pending:
+                    batches.append((name, list(pending.values())))
+
+        for name, entries in batches:
+            if len(entries) == 1:
+                msg, origins, pubsub = entries[0]
+                if origins is not None and len(origins) == 1:
+                    pubsub.send_others_on_topic(name, msg)
+                    continue
+                if origins is None:
+                    pubsub.send_all_on_topic(name, msg)
+                    continue
+            entries[-1][2].send_all_on_topic(name, Msg("batch", value=[(msg, origins) for msg, origins, _ in entries]))
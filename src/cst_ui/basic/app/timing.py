@@ -0,0 +1,130 @@
+from collections import defaultdict, deque
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from threading import Lock
+from time import perf_counter
+from typing import Callable, Deque, Dict, Optional
+
+
+@dataclass
+class NavigationRecord:
+    """Timing of a navigation, sent to the `navigation_sink` of the `App`.
+
+    * `route` : The url that was requested.
+    * `pattern` : The route pattern of the page that was shown (`None` for the 404 page).
+    * `phases` : Seconds spent in each phase, in order: `match`, `login`, `middleware:<name>`, `view`, `update`, `did_mount`.
+    * `total` : Seconds from the request of the route to the `View` being shown.
+    """
+
+    route: str
+    pattern: Optional[str] = None
+    phases: Dict[str, float] = field(default_factory=dict)
+    total: float = 0.0
+
+
+NavigationSink = Callable[[NavigationRecord], None]
+
+
+class _Phase:
+    __slots__ = ("record", "name", "start")
+
+    def __init__(self, record: NavigationRecord, name: str):
+        self.record = record
+        self.name = name
+
+    def __enter__(self):
+        self.start = perf_counter()
+
+    def __exit__(self, *exc):
+        elapsed = perf_counter() - self.start
+        self.record.phases[self.name] = self.record.phases.get(self.name, 0.0) + elapsed
+
+
+class NavigationTimer:
+    """Measures the phases of the navigation of a session, it does nothing if there is no sink."""
+
+    def __init__(self, sink: Optional[NavigationSink] = None):
+        self.sink = sink
+        self.record: Optional[NavigationRecord] = None
+        self.__start = 0.0
+
+    def start(self, route: str):
+        """Starts a record, the redirects of a navigation are added to the record already started."""
+        if self.sink is not None and self.record is None:
+            self.record = NavigationRecord(route)
+            self.__start = perf_counter()
+
+    def phase(self, name: str):
+        if self.record is None:
+            return nullcontext()
+        return _Phase(self.record, name)
+
+    def add(self, name: str, elapsed: float):
+        """Adds seconds measured elsewhere (e.g. in the executor) to a phase."""
+        if self.record is not None:
+            self.record.phases[name] = self.record.phases.get(name, 0.0) + elapsed
+
+    def finish(self, pattern: Optional[str]):
+        """Sends the record to the sink once the `View` is shown."""
+        if self.record is None:
+            return
+        record, self.record = self.record, None
+        record.pattern = pattern
+        record.total = perf_counter() - self.__start
+        self.sink(record)
+
+    def discard(self):
+        self.record = None
+
+
+def _percentile(values: list, percent: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(percent / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+class NavigationStats:
+    """Navigation sink that keeps a rolling window of timings per route and summarizes them in p50 / p95 / p99.
+
+    Example:
+    ```python
+    stats = ui.NavigationStats(window=500)
+    app = ui.App(route_init="/home", navigation_sink=stats)
+
+    stats.summary()  # -> {"/home": {"count": 10, "p50": 0.012, "p95": 0.030, "p99": 0.041}}
+    stats.summary("view")  # -> percentiles of the `view` phase.
+    ```
+    """
+
+    def __init__(self, window: int = 500, sink: Optional[NavigationSink] = None):
+        self.window = window
+        self.sink = sink
+        self.__lock = Lock()
+        self.__timings: Dict[str, Dict[str, Deque[float]]] = defaultdict(dict)
+
+    def __call__(self, record: NavigationRecord):
+        pattern = record.pattern if record.pattern is not None else "404"
+        with self.__lock:
+            timings = self.__timings[pattern]
+            for name, elapsed in (("total", record.total), *record.phases.items()):
+                timings.setdefault(name, deque(maxlen=self.window)).append(elapsed)
+        if self.sink is not None:
+            self.sink(record)
+
+    def summary(self, phase: str = "total") -> Dict[str, Dict[str, float]]:
+        """Count and p50 / p95 / p99 (seconds) of a phase for each route."""
+        with self.__lock:
+            values = {pattern: list(timings[phase]) for pattern, timings in self.__timings.items() if phase in timings}
+        return {
+            pattern: {
+                "count": len(timings),
+                "p50": _percentile(timings, 50),
+                "p95": _percentile(timings, 95),
+                "p99": _percentile(timings, 99),
+            }
+            for pattern, timings in values.items()
+        }
+
+    def clear(self):
+        with self.__lock:
+            self.__timings.clear()
@@ -2,11 +2,14 @@
 表格组件，具备：
 1. 分页
 2. 样式
-3. 搜索
+3. 排序和搜索（点击列头排序，with_search=True 显示搜索框，使用预先计算的排序和搜索索引）
+4. 虚拟滚动（virtualized=True，只构建可视区域内的行）
+5. 列式数据源（source=dict of lists、list of tuples、NumPy、DataFrame），只保存原始值；
+   DataTable 输入沿用其行和单元格控件
+6. 分页数据提供者（provider=DataProvider / AsyncDataProvider），每次只取当前页的行
 支持多种列类型：Text、Number、CheckBox、SelectBox、Datetime、Date、Time、List、Link、Image、Line、BarChart、Progress
 """
 
-import copy
 import random
 from dataclasses import dataclass
 from typing import Any
@@ -14,6 +17,20 @@ from typing import Any
 import flet as ft
 
 import cst_ui as ui
+from cst_ui.form.input import Input
+from cst_ui.layout.table_data import TableData
+from cst_ui.layout.table_index import TableIndex
+from cst_ui.layout.table_provider import DataProvider, SortSpec, call_provider
+from cst_ui.layout.table_virtual import VirtualRows
+
+NUMBER_COLUMN_LABEL = '编号'
+# 所有行共用的悬浮颜色
+ROW_COLOR = {ft.ControlState.HOVERED: ft.Colors.with_opacity(0.1, ft.Colors.BLUE)}
+
+
+def format_value(value: Any) -> str:
+    """单元格显示的文本"""
+    return '' if value is None else str(value)
 
 
 @dataclass
@@ -23,15 +40,52 @@ class Table(ft.Column):
     """
 
     DEFAULT_ROW_PER_PAGE: int = 10  # 默认每页行数
-    data_table: ft.DataTable | None = None  # 输入的 DataTable 对象
+    data_table: ft.DataTable | None = None  # 输入的 DataTable 对象（兼容旧用法，沿用其行和单元格控件）
+    source: Any = None  # 列式数据：dict of lists、list of tuples、NumPy 数组、DataFrame
+    column_names: list[str] | None = None  # list of tuples 的列名
+    provider: Any = None  # 分页数据提供者（DataProvider / AsyncDataProvider），数据不加载到内存
     rows_per_page: int = DEFAULT_ROW_PER_PAGE  # 每页显示的行数
     with_paged: bool = True  # 是否启用分页
     init_width: int | None = None  # 初始宽度
     with_number: bool = True  # 是否显示编号列
+    with_search: bool = False  # 是否显示搜索框
+    virtualized: bool = False  # 是否虚拟滚动（不分页，只构建可视区域内的行）
+    row_height: int = 48  # 虚拟滚动的行高
+    viewport_height: int = 480  # 虚拟滚动的可视区域高度
+    overscan: int = 10  # 虚拟滚动时可视区域上下额外构建的行数
 
     def __post_init__(self, ref: ft.Ref[Any] | None):
-        # 深拷贝输入的 DataTable，避免外部数据被修改
-        self.input_data_table = copy.deepcopy(self.data_table)
+        assert not (self.virtualized and self.provider is not None), '虚拟滚动不支持 provider'
+
+        # 排序和搜索条件，排序的列号不包含编号列
+        self.sort_spec: SortSpec | None = None
+        self.search_text: str | None = None
+        # 排序和搜索后显示的行号（None 为原始顺序）
+        self.view_rows: list[int] | None = None
+        # 当前页的行控件（key -> DataRow），刷新时按 key 复用
+        self.row_controls: dict[Any, ft.DataRow] = {}
+        # DataTable 输入的行（调用方的行控件，按数据的行号）
+        self.source_rows: list[ft.DataRow] | None = None
+
+        # provider 的状态：当前页的行、总条数
+        self.page_rows: list = []
+        self.page_offset = 0
+        self.provider_count = 0
+        self.count_dirty = True
+        # 正在进行的请求，点击过快时取消旧的请求
+        self.request_seq = 0
+        self.pending_request = None
+        self.loading = False
+        self.is_mounted = False
+
+        # 列式数据源：只保存原始值，行控件只为当前页构建；DataTable 输入不复制控件树，直接显示其行
+        self.set_source(
+            next(
+                (source for source in (self.provider, self.source, self.data_table) if source is not None),
+                None,
+            ),
+            self.column_names,
+        )
         self.init_data_per_page_nums = self.rows_per_page
         self.current_page = 1
 
@@ -41,35 +95,73 @@ class Table(ft.Column):
         self.paged_padding_top = 10
         self.paged_padding_bottom = 10
 
+        # 搜索框
+        self.v_search = Input(
+            hint_text='搜索',
+            prefix_icon=ft.Icons.SEARCH,
+            on_change=self.handle_search_change,
+            width=240,
+            height=32,
+            content_padding=ft.Padding.only(left=10, right=10),
+        )
+
+        # 加载中的进度条（provider 取数据时显示）
+        self.v_loading = ft.ProgressBar(visible=False, height=2)
+
         # 分页控件
         self.v_paging = ui.Paging(sum_data_nums=self.num_rows, on_change_page=self.set_page)
 
-        # Flet DataTable 控件
+        # Flet DataTable 控件（虚拟滚动时只用来保存列定义）
         self.ft_data_table = ft.DataTable(
-            columns=self.input_data_table.columns,
-            rows=self.build_rows(),
+            columns=self.display_columns(),
+            rows=[] if self.virtualized else self.build_rows(),
             heading_row_color='#f4f4f4',
-            sort_column_index=2,
+            sort_column_index=None,
+            sort_ascending=True,
             horizontal_lines=ft.BorderSide(1, '#EDEEF4'),
             border=ft.Border.all(1, '#eeeeee'),
             expand=self.expand,
             width=10000,
         )
 
+        # 虚拟滚动的表头和行
+        if self.virtualized:
+            self.v_header = ft.Container(
+                content=ft.Row(spacing=0),
+                height=self.row_height,
+                bgcolor='#f4f4f4',
+                padding=ft.Padding.only(left=16, right=16),
+            )
+            self.v_virtual_rows = VirtualRows(
+                total_rows=self.num_rows,
+                column_count=self.num_columns,
+                get_value=self.cell_value,
+                row_height=self.row_height,
+                viewport_height=self.viewport_height,
+                overscan=self.overscan,
+            )
+            self.refresh_header()
+
         # 表格外层卡片
         self.v_row_table = ft.Card(
             ft.Container(
-                content=self.ft_data_table,
+                content=ft.Column(
+                    [self.v_loading, self.v_header, self.v_virtual_rows]
+                    if self.virtualized
+                    else [self.v_loading, self.ft_data_table],
+                    spacing=0,
+                ),
                 bgcolor=ft.Colors.WHITE,
                 border=ft.Border.all(1, ft.Colors.GREY_400),
             ),
         )
 
         # 组装最终视图
-        if self.with_paged:
+        table_controls = [self.v_search, self.v_row_table] if self.with_search else [self.v_row_table]
+        if self.with_paged and not self.virtualized:
             self.ui_view = ft.Card(
                 content=ft.Container(
-                    content=ft.Column([self.v_row_table, self.v_paging], scroll=ft.ScrollMode.AUTO),
+                    content=ft.Column(table_controls + [self.v_paging], scroll=ft.ScrollMode.AUTO),
                     padding=ft.Padding.only(
                         left=self.paged_padding_left,
                         right=self.paged_padding_right,
@@ -80,6 +172,8 @@ class Table(ft.Column):
                 ),
                 elevation=2,
             )
+        elif self.with_search:
+            self.ui_view = ft.Column(table_controls)
         else:
             self.ui_view = self.v_row_table
 
@@ -94,7 +188,16 @@ class Table(ft.Column):
     @property
     def num_rows(self) -> int:
         """表格总行数"""
-        return len(self.input_data_table.rows)
+        if self.provider is not None:
+            return self.provider_count
+        if self.view_rows is not None:
+            return len(self.view_rows)
+        return len(self.table_data)
+
+    @property
+    def num_columns(self) -> int:
+        """显示的列数（包含编号列）"""
+        return self.table_data.num_columns + (1 if self.with_number else 0)
 
     @property
     def num_pages(self) -> int:
@@ -107,25 +210,139 @@ class Table(ft.Column):
         return self.ft_data_table.columns
 
     @property
-    def data_rows(self):
-        """表格所有行"""
-        return self.input_data_table.rows
+    def data_rows(self) -> TableData:
+        """表格所有行（原始值，按行号取出 tuple）"""
+        return self.table_data
+
+    def build_columns(self, source: Any) -> list:
+        """
+        数据列的 DataColumn（DataTable 输入时沿用其列定义），点击列头排序
+        """
+        if isinstance(source, ft.DataTable):
+            columns = list(source.columns)
+            if columns and getattr(columns[0].label, 'value', None) == NUMBER_COLUMN_LABEL:
+                columns = columns[1:]
+        else:
+            columns = [ft.DataColumn(label=ft.Text(str(name))) for name in self.table_data.columns]
+        for column in columns:
+            if column.on_sort is None:
+                column.on_sort = self.handle_sort
+        return columns
+
+    def display_columns(self) -> list:
+        """
+        显示的列（自动添加编号列）
+        """
+        if self.with_number:
+            return [ft.DataColumn(label=ft.Text(NUMBER_COLUMN_LABEL))] + self.input_columns
+        return list(self.input_columns)
+
+    def set_source(self, source: Any, column_names: list[str] | None = None):
+        """
+        设置数据：DataProvider / AsyncDataProvider、ft.DataTable 或任意列式数据
+        """
+        self.source_rows = None
+        if isinstance(source, DataProvider):
+            self.provider = source
+            self.table_data = TableData.from_source(None, list(source.columns))
+        elif isinstance(source, ft.DataTable):
+            # 值用于排序和搜索，显示时沿用调用方的行和单元格控件（Checkbox、Image 等）
+            self.provider = None
+            self.table_data = TableData.from_data_table(source, NUMBER_COLUMN_LABEL)
+            self.source_rows = list(source.rows or [])
+        else:
+            self.provider = None
+            self.table_data = TableData.from_source(source, column_names)
+        self.row_controls = {}
+        self.table_index = TableIndex(self.table_data)
+        self.input_columns = self.build_columns(source)
+        # 列可能变化，清除排序条件
+        self.sort_spec = None
+        self.page_rows = []
+        self.count_dirty = True
+        self.apply_view()
+
+    def apply_view(self):
+        """
+        按排序和搜索条件计算显示的行号（只查索引）
+        """
+        if self.provider is not None:
+            self.view_rows = None
+        else:
+            self.view_rows = self.table_index.rows(self.sort_spec, self.search_text)
+
+    def sort_by(self, column_index: int | None, ascending: bool = True):
+        """
+        按数据列排序（column_index 不包含编号列），None 取消排序
+        """
+        self.sort_spec = None if column_index is None else (column_index, ascending)
+        self.ft_data_table.sort_column_index = (
+            None if column_index is None else column_index + (1 if self.with_number else 0)
+        )
+        self.ft_data_table.sort_ascending = ascending
+        self.apply_view()
+        self.refresh_data()
+
+    def search(self, text: str | None):
+        """
+        搜索（每个词匹配某个单元格中以它开头的词），回到第一页
+        """
+        self.search_text = text or None
+        self.current_page = 1
+        self.v_paging.current_page = 1
+        self.count_dirty = True
+        self.apply_view()
+        self.refresh_data()
 
-    def update_data_table(self, data_table=None):
+    def append_row(self, row: Any):
         """
-        更新表格数据和列定义
+        追加一行，排序和搜索索引增量更新
+        """
+        assert self.provider is None, 'provider 的数据请在数据源中修改后调用 reload()'
+        if self.source_rows is not None:
+            # DataTable 输入可以追加 DataRow，也可以追加值（显示为文本）
+            if not isinstance(row, ft.DataRow):
+                row = ft.DataRow(cells=[ft.DataCell(ft.Text(format_value(value))) for value in row])
+            values = TableData.row_values(row, self.table_data.num_columns)
+            self.source_rows.append(row)
+            row = values
+        self.table_data.append(row)
+        self.table_index.append(len(self.table_data) - 1)
+        self.apply_view()
+        self.refresh_data()
+
+    def set_cell_value(self, row_index: int, column_index: int, value: Any):
+        """
+        修改单元格（row_index 为数据的行号，column_index 不包含编号列），排序和搜索索引增量更新
+        """
+        assert self.provider is None, 'provider 的数据请在数据源中修改后调用 reload()'
+        old_value = self.table_data.value(row_index, column_index)
+        self.table_data.set_value(row_index, column_index, value)
+        self.table_index.update_value(row_index, column_index, old_value)
+        if self.source_rows is not None:
+            # DataTable 输入：改写调用方单元格控件的值
+            content = self.source_cells(self.source_rows[row_index])[column_index].content
+            if hasattr(content, 'value'):
+                content.value = value
+        self.apply_view()
+        self.refresh_data()
+
+    def handle_sort(self, e):
+        """列头点击排序事件"""
+        self.sort_by(e.column_index - (1 if self.with_number else 0), e.ascending)
+
+    def handle_search_change(self, e):
+        """搜索框输入事件"""
+        self.search(e.control.value)
+
+    def update_data_table(self, data_table: Any = None, column_names: list[str] | None = None):
+        """
+        更新表格数据和列定义，data_table 可以是 DataProvider、ft.DataTable 或任意列式数据
         """
         if data_table is not None:
-            self.input_data_table = data_table
-        self.ft_data_table.columns = self.input_data_table.columns
-
-        # 自动添加编号列
-        if (
-            self.with_number
-            and len(self.ft_data_table.columns) >= 1
-            and self.ft_data_table.columns[0].label.value != '编号'
-        ):
-            self.ft_data_table.columns.insert(0, ft.DataColumn(label=ft.Text('编号')))
+            self.set_source(data_table, column_names)
+            self.ft_data_table.sort_column_index = None
+        self.ft_data_table.columns = self.display_columns()
         self.refresh_data()
 
     def set_page(self, page: str | int | None = None, delta: int = 0):
@@ -144,70 +361,257 @@ class Table(ft.Column):
             return
         self.refresh_data()
 
-    def build_rows(self) -> list:
+    def page_slice(self) -> slice:
         """
-        构建当前页的数据行
+        当前页的行号范围
         """
         if self.with_paged:
-            index_start = (self.current_page - 1) * self.data_per_page_nums
-            index_end = self.current_page * self.data_per_page_nums
-        else:
-            index_start = 0
-            index_end = -1
-
-        rst_rows = []
-        # 遍历当前页的数据行
-        for idx, row in enumerate(self.input_data_table.rows[slice(index_start, index_end)]):
-            # 自动补充编号列
-            if self.with_number and (len(row.cells) < len(self.input_data_table.columns)):
-                row.cells.insert(0, ft.DataCell(ft.Text(index_start + idx + 1)))
-            # 设置悬浮颜色
-            row.color = {ft.ControlState.HOVERED: ft.Colors.with_opacity(0.1, ft.Colors.BLUE)}
-            # 行选中事件（可自定义）
-            row.on_select_changed = lambda e: e
-            rst_rows.append(row)
-        return rst_rows
+            return slice((self.current_page - 1) * self.data_per_page_nums, self.current_page * self.data_per_page_nums)
+        return slice(0, None)
+
+    def page_range(self) -> range:
+        """
+        当前页显示的行号
+        """
+        if self.provider is not None:
+            return range(self.page_offset, self.page_offset + len(self.page_rows))
+        return range(*self.page_slice().indices(self.num_rows))
+
+    def row_key(self, row_index: int) -> Any:
+        """
+        行的 key：数据的行号，排序和搜索后不变
+        """
+        if self.view_rows is not None:
+            return self.view_rows[row_index]
+        return row_index
+
+    def build_row(self) -> ft.DataRow:
+        """
+        新建行控件，悬浮颜色和选中事件所有行共用
+        """
+        return ft.DataRow(
+            cells=[ft.DataCell(ft.Text('')) for _ in range(self.num_columns)],
+            color=ROW_COLOR,
+            on_select_changed=self.handle_row_select,
+        )
+
+    def patch_row(self, row: ft.DataRow, row_index: int):
+        """
+        把行控件改写为第 row_index 行，只改写值变化的单元格
+        """
+        if len(row.cells) != self.num_columns:
+            row.cells = [ft.DataCell(ft.Text('')) for _ in range(self.num_columns)]
+        for column_index, cell in enumerate(row.cells):
+            text = format_value(self.cell_value(row_index, column_index))
+            if cell.content.value != text:
+                cell.content.value = text
+
+    def source_cells(self, row: ft.DataRow) -> list:
+        """
+        DataTable 输入的行中数据列的单元格（不包含行首的编号单元格）
+        """
+        return row.cells[max(0, len(row.cells) - self.table_data.num_columns) :]
+
+    def patch_source_row(self, row: ft.DataRow, row_index: int):
+        """
+        DataTable 输入的行显示为第 row_index 行：沿用调用方的单元格控件和行属性（selected、color、
+        on_select_changed 等），只补充或改写编号单元格，未设置的悬浮颜色和选中事件使用默认值
+        """
+        number_cells = len(row.cells) - self.table_data.num_columns
+        if self.with_number:
+            if number_cells < 1:
+                row.cells.insert(0, ft.DataCell(ft.Text('')))
+            number = row.cells[0].content
+            text = str(row_index + 1)
+            if getattr(number, 'value', None) != text:
+                number.value = text
+        elif number_cells > 0:
+            del row.cells[:number_cells]
+        if row.color is None:
+            row.color = ROW_COLOR
+        if row.on_select_changed is None:
+            row.on_select_changed = self.handle_row_select
+
+    def build_rows(self) -> list:
+        """
+        构建当前页的数据行：key 相同的行沿用上一次的行控件，其余行复用不再显示的行控件，
+        只改写值变化的单元格，翻页或修改单元格时只发送变化的值。
+        DataTable 输入直接显示调用方的行控件
+        """
+        if self.source_rows is not None:
+            rows = []
+            for row_index in self.page_range():
+                row = self.source_rows[self.row_key(row_index)]
+                self.patch_source_row(row, row_index)
+                rows.append(row)
+            return rows
+
+        row_range = self.page_range()
+        keys = [self.row_key(row_index) for row_index in row_range]
+        wanted = set(keys)
+        spare_rows = iter([row for key, row in self.row_controls.items() if key not in wanted])
+
+        row_controls = {}
+        for row_index, key in zip(row_range, keys):
+            row = self.row_controls.get(key)
+            if row is None:
+                row = next(spare_rows, None)
+            if row is None:
+                row = self.build_row()
+            row.data = key
+            self.patch_row(row, row_index)
+            row_controls[key] = row
+        self.row_controls = row_controls
+        return list(row_controls.values())
+
+    def handle_row_select(self, e):
+        """行选中事件（可自定义）"""
+        return e
+
+    def cell_value(self, row_index: int, column_index: int) -> Any:
+        """
+        第 row_index 行、第 column_index 列（包含编号列）的值
+        """
+        if self.with_number:
+            if column_index == 0:
+                return row_index + 1
+            column_index -= 1
+        if self.provider is not None:
+            row = self.page_rows[row_index - self.page_offset]
+            return row[column_index] if column_index < len(row) else None
+        if self.view_rows is not None:
+            row_index = self.view_rows[row_index]
+        return self.table_data.value(row_index, column_index)
+
+    def refresh_header(self):
+        """
+        刷新虚拟滚动的表头
+        """
+        sort_column_index = self.ft_data_table.sort_column_index
+        arrow = ' ↑' if self.ft_data_table.sort_ascending else ' ↓'
+        self.v_header.content.controls = [
+            ft.Container(
+                content=ft.Text(
+                    getattr(column.label, 'value', '') + (arrow if column_index == sort_column_index else ''),
+                    weight=ft.FontWeight.BOLD,
+                ),
+                expand=1,
+                data=column_index,
+                on_click=self.handle_header_click if column.on_sort is not None else None,
+            )
+            for column_index, column in enumerate(self.display_columns())
+        ]
+
+    def handle_header_click(self, e):
+        """虚拟滚动表头点击排序：再次点击同一列时切换升序和降序"""
+        column_index = e.control.data
+        ascending = not (self.ft_data_table.sort_column_index == column_index and self.ft_data_table.sort_ascending)
+        self.sort_by(column_index - (1 if self.with_number else 0), ascending)
 
     def refresh_data(self):
         """
         刷新表格数据和分页控件
         """
-        self.ft_data_table.rows = self.build_rows()
+        if self.provider is not None:
+            self.load_page()
+            return
+        if self.virtualized:
+            self.refresh_header()
+            self.v_virtual_rows.set_total_rows(self.num_rows, self.num_columns)
+        else:
+            self.ft_data_table.rows = self.build_rows()
         self.v_paging.update_sum_data_nums(value=self.num_rows)
 
+    def reload(self):
+        """
+        重新统计总条数并刷新当前页（provider 的数据变化后调用）
+        """
+        self.count_dirty = True
+        self.refresh_data()
+
+    def set_loading(self, loading: bool):
+        """
+        加载状态：显示进度条
+        """
+        self.loading = loading
+        self.v_loading.visible = loading
+
+    def load_page(self):
+        """
+        从 provider 异步加载当前页，点击过快时取消上一次未完成的请求
+        """
+        if not self.is_mounted:
+            return
+        if self.pending_request is not None and not self.pending_request.done():
+            self.pending_request.cancel()
+        self.request_seq += 1
+        self.set_loading(True)
+        self.update()
+        self.pending_request = self.page.run_task(self.fetch_page, self.request_seq)
+
+    async def fetch_page(self, request_seq: int):
+        """
+        取出总条数（搜索条件变化后）和当前页的行，过期的请求不会更新表格
+        """
+        try:
+            if self.count_dirty:
+                count = await call_provider(self.provider.count, self.search_text)
+                if request_seq != self.request_seq:
+                    return
+                self.provider_count = count
+                self.count_dirty = False
+                self.v_paging.update_sum_data_nums(value=count)
+                # 总条数变少时回到最后一页
+                self.current_page = max(1, min(self.current_page, self.num_pages))
+
+            page_slice = self.page_slice()
+            offset = page_slice.start
+            limit = (page_slice.stop if page_slice.stop is not None else self.provider_count) - offset
+            rows = await call_provider(self.provider.fetch, offset, limit, self.sort_spec, self.search_text)
+        except Exception:
+            if request_seq == self.request_seq:
+                self.set_loading(False)
+                self.update()
+            raise
+
+        if request_seq != self.request_seq:
+            return
+        self.page_offset = offset
+        self.page_rows = list(rows)
+        self.ft_data_table.rows = self.build_rows()
+        self.set_loading(False)
+        self.update()
+
     def did_mount(self):
         """
         组件挂载时自动刷新数据
         """
-        self.update_data_table(self.input_data_table)
+        self.is_mounted = True
+        self.update_data_table()
+
+    def will_unmount(self):
+        """
+        组件卸载时取消未完成的请求
+        """
+        self.is_mounted = False
+        if self.pending_request is not None:
+            self.pending_request.cancel()
+            self.pending_request = None
 
 
 def demo():
     """
     表格控件演示
     """
-    rows = []
-    for i in range(200):
-        rows.append(
-            ft.DataRow(
-                cells=[
-                    ft.DataCell(ft.Text('John')),
-                    ft.DataCell(ft.Text('Smith')),
-                    ft.DataCell(ft.Text(str(random.random()))),
-                ]
-            )
-        )
-    data_table = ft.DataTable(
-        columns=[
-            ft.DataColumn(label=ft.Text('First name')),
-            ft.DataColumn(label=ft.Text('Last name')),
-            ft.DataColumn(label=ft.Text('Age'), numeric=True),
-        ],
-        rows=rows,
-    )
-    print(f'Table: {len(data_table.rows)}')
-
-    return ft.Column(controls=[Table(data_table=data_table, rows_per_page=10, with_paged=True)])
+    size = 200
+    source = {
+        'First name': ['John'] * size,
+        'Last name': ['Smith'] * size,
+        'Age': [random.random() for _ in range(size)],
+    }
+    print(f'Table: {size}')
+
+    return ft.Column(controls=[Table(source=source, rows_per_page=10, with_paged=True)])
 
 
 def main(page: ft.Page):
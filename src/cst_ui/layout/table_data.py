@@ -0,0 +1,125 @@
+"""
+表格的列式数据源：
+只保存原始值（dict of lists、list of tuples、NumPy 数组、DataFrame），行控件只为当前页构建。
+"""
+
+from typing import Any, Iterator, Sequence
+
+import flet as ft
+
+
+class TableData:
+    """
+    列式数据源，按列保存原始值。
+
+    支持的数据：
+    - dict of lists / arrays：`{'姓名': [...], '年龄': [...]}`
+    - list of tuples：`[('John', 20), ...]`，需要 `columns` 指定列名（否则使用 列1、列2...）
+    - DataFrame：按列取出 NumPy 数组，不复制行
+    - ft.DataTable：兼容旧用法，从单元格中取出值
+
+    list 列会被复制；NumPy 数组等按引用保存，第一次追加或修改时转换为 list，不会修改传入的数据。
+    """
+
+    def __init__(self, columns: Sequence[str], data: Sequence[Sequence[Any]], length: int | None = None):
+        self.columns = list(columns)  # 列名
+        self.data = list(data)  # 每列的值
+        self.length = len(self.data[0]) if length is None and self.data else (length or 0)
+        assert len(self.columns) == len(self.data), '列名和列的数量不一致'
+        assert all(len(column) == self.length for column in self.data), '每列的行数必须相同'
+
+    @classmethod
+    def from_source(cls, source: Any, columns: Sequence[str] | None = None) -> 'TableData':
+        """
+        根据输入数据创建列式数据源
+        """
+        if source is None:
+            return cls(columns or [], [[] for _ in columns or []])
+        if isinstance(source, TableData):
+            return source
+        if isinstance(source, ft.DataTable):
+            return cls.from_data_table(source)
+        if isinstance(source, dict):
+            # 复制 list，追加或修改时不影响传入的数据
+            return cls(
+                list(source.keys()),
+                [list(column) if isinstance(column, (list, tuple)) else column for column in source.values()],
+            )
+        # DataFrame 等：按列取出数组
+        if hasattr(source, 'columns') and hasattr(source, 'to_numpy'):
+            names = [str(name) for name in source.columns]
+            return cls(names, [source[name].to_numpy() for name in source.columns], len(source))
+        # list of tuples：行转列
+        rows = list(source)
+        width = len(columns) if columns is not None else (len(rows[0]) if rows else 0)
+        names = list(columns) if columns is not None else [f'列{i + 1}' for i in range(width)]
+        return cls(names, [list(column) for column in zip(*rows)] if rows else [[] for _ in names], len(rows))
+
+    @classmethod
+    def from_data_table(cls, data_table: ft.DataTable, number_label: str | None = None) -> 'TableData':
+        """
+        从 ft.DataTable 中取出列名和单元格的值（只保存值，不保存控件），
+        第一列的列名为 number_label 时作为编号列跳过
+        """
+        names = [getattr(column.label, 'value', str(column.label)) for column in data_table.columns]
+        if number_label is not None and names[:1] == [number_label]:
+            names = names[1:]
+        rows = [cls.row_values(row, len(names)) for row in data_table.rows or []]
+        return cls(names, [list(column) for column in zip(*rows)] if rows else [[] for _ in names], len(rows))
+
+    @staticmethod
+    def row_values(row: ft.DataRow, num_columns: int) -> list:
+        """
+        DataRow 中数据列单元格的值：单元格比列多时，多出的是行首的编号单元格；
+        没有 value 的控件（Image 等）取 None
+        """
+        cells = row.cells[max(0, len(row.cells) - num_columns) :]
+        values = [getattr(cell.content, 'value', None) for cell in cells]
+        return values + [None] * (num_columns - len(values))
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __getitem__(self, row_index: int) -> tuple:
+        """第 row_index 行的值"""
+        return tuple(column[row_index] for column in self.data)
+
+    def __iter__(self) -> Iterator[tuple]:
+        for row_index in range(self.length):
+            yield self[row_index]
+
+    @property
+    def num_columns(self) -> int:
+        return len(self.columns)
+
+    def value(self, row_index: int, column_index: int) -> Any:
+        """单元格的值"""
+        return self.data[column_index][row_index]
+
+    def column(self, column_index: int) -> Sequence[Any]:
+        """整列的值"""
+        return self.data[column_index]
+
+    def append(self, row: Sequence[Any]):
+        """
+        追加一行，值的数量必须与列数相同
+        """
+        if len(row) != self.num_columns:
+            raise ValueError(f'追加的行有 {len(row)} 个值，表格有 {self.num_columns} 列')
+        for column_index, value in enumerate(row):
+            column = self.data[column_index]
+            # NumPy 数组等不能追加的列，第一次追加时转换为 list
+            if not isinstance(column, list):
+                column = self.data[column_index] = list(column)
+            column.append(value)
+        self.length += 1
+
+    def set_value(self, row_index: int, column_index: int, value: Any):
+        """
+        修改单元格的值
+        """
+        column = self.data[column_index]
+        # NumPy 数组等按引用保存的列，第一次修改时转换为 list，不修改传入的数据
+        if not isinstance(column, list):
+            column = self.data[column_index] = list(column)
+        column[row_index] = value
@@ -0,0 +1,178 @@
+"""
+表格的排序和搜索索引：
+每列的排序结果（行号的排列）只计算一次，搜索使用分词后的前缀索引，排序或搜索时只查索引，不再排序整张表。
+追加行或修改单元格时增量更新索引。
+"""
+
+import re
+from bisect import bisect_left, insort
+from numbers import Real
+from typing import Any, Callable
+
+from cst_ui.layout.table_data import TableData
+from cst_ui.layout.table_provider import SortSpec
+
+TOKEN_PATTERN = re.compile(r'\w+')
+
+
+def sort_key(value: Any) -> tuple:
+    """
+    排序键：数字在前、文本在后、空值（None、NaN）排在最后，不同类型的值也可以比较
+    """
+    # NaN 与任何值比较都为 False，会破坏排序结果，与 None 一样作为空值
+    if value is None or value != value:
+        return (2, 0)
+    if isinstance(value, Real):
+        return (0, value)
+    return (1, str(value))
+
+
+def tokenize(value: Any) -> set[str]:
+    """单元格的值分词（小写）"""
+    if value is None:
+        return set()
+    return set(TOKEN_PATTERN.findall(str(value).lower()))
+
+
+class SearchIndex:
+    """
+    搜索索引：分词 -> 行号集合，分词按字母排序，前缀搜索时二分查找。
+    搜索文本的每个词都要匹配（某个分词以它开头）。
+    """
+
+    def __init__(self, table_data: TableData):
+        self.table_data = table_data
+        self.postings: dict[str, set[int]] = {}
+        for row_index in range(len(table_data)):
+            for token in self.row_tokens(row_index):
+                self.postings.setdefault(token, set()).add(row_index)
+        self.tokens = sorted(self.postings)
+
+    def row_tokens(self, row_index: int, skip_column: int | None = None) -> set[str]:
+        """一行的全部分词"""
+        tokens = set()
+        for column_index in range(self.table_data.num_columns):
+            if column_index != skip_column:
+                tokens |= tokenize(self.table_data.value(row_index, column_index))
+        return tokens
+
+    def add(self, row_index: int, tokens: set[str]):
+        """把行加入分词的行号集合"""
+        for token in tokens:
+            rows = self.postings.get(token)
+            if rows is None:
+                rows = self.postings[token] = set()
+                insort(self.tokens, token)
+            rows.add(row_index)
+
+    def remove(self, row_index: int, tokens: set[str]):
+        """把行从分词的行号集合中移除"""
+        for token in tokens:
+            rows = self.postings.get(token)
+            if rows is None:
+                continue
+            rows.discard(row_index)
+            if not rows:
+                del self.postings[token]
+                del self.tokens[bisect_left(self.tokens, token)]
+
+    def prefix_rows(self, prefix: str) -> set[int]:
+        """分词以 prefix 开头的全部行"""
+        rows = set()
+        position = bisect_left(self.tokens, prefix)
+        while position < len(self.tokens) and self.tokens[position].startswith(prefix):
+            rows |= self.postings[self.tokens[position]]
+            position += 1
+        return rows
+
+    def search(self, text: str | None) -> set[int] | None:
+        """
+        搜索：返回匹配的行号，没有搜索词时返回 None（全部行）
+        """
+        words = TOKEN_PATTERN.findall((text or '').lower())
+        if not words:
+            return None
+        # 先查匹配行少的词
+        rows_list = sorted((self.prefix_rows(word) for word in set(words)), key=len)
+        rows = rows_list[0]
+        for other in rows_list[1:]:
+            if not rows:
+                break
+            rows = rows & other
+        return rows
+
+
+class TableIndex:
+    """
+    表格的索引：每列的排序结果在第一次按该列排序时计算，搜索索引在第一次搜索时构建。
+    """
+
+    def __init__(self, table_data: TableData):
+        self.table_data = table_data
+        self.sort_keys: dict[int, list[tuple]] = {}  # 列号 -> 每行的排序键
+        self.sort_orders: dict[int, list[int]] = {}  # 列号 -> 升序排列的行号
+        self.search_index: SearchIndex | None = None
+
+    def order_key(self, column_index: int) -> Callable[[int], tuple]:
+        """行号在排序结果中的比较键（排序键相同时按行号）"""
+        keys = self.sort_keys[column_index]
+        return lambda row_index: (keys[row_index], row_index)
+
+    def sort_order(self, column_index: int) -> list[int]:
+        """
+        按列升序排列的行号（缓存）
+        """
+        order = self.sort_orders.get(column_index)
+        if order is None:
+            keys = self.sort_keys[column_index] = [sort_key(value) for value in self.table_data.column(column_index)]
+            order = self.sort_orders[column_index] = sorted(range(len(keys)), key=keys.__getitem__)
+        return order
+
+    def search(self, text: str | None) -> set[int] | None:
+        """
+        搜索匹配的行号，没有搜索词时返回 None
+        """
+        if not (text and text.strip()):
+            return None
+        if self.search_index is None:
+            self.search_index = SearchIndex(self.table_data)
+        return self.search_index.search(text)
+
+    def rows(self, sort: SortSpec | None = None, text: str | None = None) -> list[int] | None:
+        """
+        排序和搜索后显示的行号，不排序也不搜索时返回 None（原始顺序）
+        """
+        matched = self.search(text)
+        if sort is None:
+            return None if matched is None else sorted(matched)
+        column_index, ascending = sort
+        order = self.sort_order(column_index)
+        if matched is not None:
+            order = [row_index for row_index in order if row_index in matched]
+        return order if ascending else order[::-1]
+
+    def append(self, row_index: int):
+        """
+        追加行之后更新索引
+        """
+        for column_index, order in self.sort_orders.items():
+            self.sort_keys[column_index].append(sort_key(self.table_data.value(row_index, column_index)))
+            insort(order, row_index, key=self.order_key(column_index))
+        if self.search_index is not None:
+            self.search_index.add(row_index, self.search_index.row_tokens(row_index))
+
+    def update_value(self, row_index: int, column_index: int, old_value: Any):
+        """
+        修改单元格之后更新索引（old_value 为修改前的值）
+        """
+        order = self.sort_orders.get(column_index)
+        if order is not None:
+            key = self.order_key(column_index)
+            del order[bisect_left(order, key(row_index), key=key)]
+            self.sort_keys[column_index][row_index] = sort_key(self.table_data.value(row_index, column_index))
+            insort(order, row_index, key=key)
+        if self.search_index is not None:
+            # 同一行的其他列可能有相同的分词
+            others = self.search_index.row_tokens(row_index, skip_column=column_index)
+            self.search_index.remove(row_index, tokenize(old_value) - others)
+            self.search_index.add(row_index, tokenize(self.table_data.value(row_index, column_index)))
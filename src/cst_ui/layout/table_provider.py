@@ -0,0 +1,143 @@
+"""
+表格的分页数据提供者：
+数据保存在数据库等外部存储中，表格每次只取当前页的行（offset、limit），总条数由 count() 提供。
+"""
+
+import sqlite3
+import threading
+from asyncio import get_running_loop
+from inspect import isawaitable, iscoroutinefunction
+from typing import Any, Protocol, Sequence, Union, runtime_checkable
+
+# 排序：(数据列号, 是否升序)，数据列号不包含编号列
+SortSpec = tuple[int, bool]
+
+
+@runtime_checkable
+class DataProvider(Protocol):
+    """
+    同步数据提供者。
+
+    - `columns`：列名
+    - `count(filter)`：满足搜索条件的总条数
+    - `fetch(offset, limit, sort, filter)`：从 offset 开始的 limit 行，每行是一个 tuple
+    """
+
+    columns: Sequence[str]
+
+    def count(self, filter: str | None = None) -> int: ...
+
+    def fetch(
+        self, offset: int, limit: int, sort: SortSpec | None = None, filter: str | None = None
+    ) -> Sequence[tuple]: ...
+
+
+@runtime_checkable
+class AsyncDataProvider(Protocol):
+    """
+    异步数据提供者，方法与 `DataProvider` 相同，返回协程。
+    """
+
+    columns: Sequence[str]
+
+    async def count(self, filter: str | None = None) -> int: ...
+
+    async def fetch(
+        self, offset: int, limit: int, sort: SortSpec | None = None, filter: str | None = None
+    ) -> Sequence[tuple]: ...
+
+
+AnyDataProvider = Union[DataProvider, AsyncDataProvider]
+
+
+async def call_provider(method: Any, *args) -> Any:
+    """
+    调用数据提供者的方法：异步方法直接等待，同步方法放到线程池中执行，不阻塞事件循环
+    """
+    if iscoroutinefunction(method):
+        return await method(*args)
+    result = await get_running_loop().run_in_executor(None, method, *args)
+    if isawaitable(result):
+        return await result
+    return result
+
+
+def quote_identifier(name: str) -> str:
+    """SQLite 标识符（表名、列名）"""
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+class SQLiteProvider:
+    """
+    SQLite 数据提供者（参考实现），只读取当前页的行，适合百万行以上的表。
+
+    - `path`：数据库文件路径
+    - `table`：表名（或视图名）
+    - `columns`：显示的列，默认为表的全部列
+    - `search_columns`：搜索时匹配的列，默认为显示的列
+    - `key_column`：唯一的列（默认 rowid，视图需要指定），加在每个 ORDER BY 的最后，
+      排序列的值相同时分页结果仍然是确定的，翻页时不会重复或遗漏行
+
+    示例：
+    ```python
+    provider = SQLiteProvider('data.db', 'users', columns=['name', 'age'])
+    Table(provider=provider)
+    ```
+    """
+
+    def __init__(
+        self,
+        path: str,
+        table: str,
+        columns: Sequence[str] | None = None,
+        search_columns: Sequence[str] | None = None,
+        key_column: str = 'rowid',
+    ):
+        self.path = path
+        self.table = table
+        self.key_column = key_column
+        # 每个线程一个连接（sqlite3 连接不能跨线程使用）
+        self.__local = threading.local()
+        self.columns = list(columns) if columns is not None else self.table_columns()
+        self.search_columns = list(search_columns) if search_columns is not None else self.columns
+
+    def connection(self) -> sqlite3.Connection:
+        """当前线程的连接"""
+        connection = getattr(self.__local, 'connection', None)
+        if connection is None:
+            connection = self.__local.connection = sqlite3.connect(self.path)
+        return connection
+
+    def table_columns(self) -> list[str]:
+        """表的全部列名"""
+        cursor = self.connection().execute(f'SELECT * FROM {quote_identifier(self.table)} LIMIT 0')
+        return [description[0] for description in cursor.description]
+
+    def where(self, filter: str | None) -> tuple[str, list]:
+        """搜索条件：任意一列包含搜索文本"""
+        if not filter:
+            return '', []
+        pattern = '%' + filter.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+        conditions = ' OR '.join(
+            f"CAST({quote_identifier(column)} AS TEXT) LIKE ? ESCAPE '\\'" for column in self.search_columns
+        )
+        return f' WHERE {conditions}', [pattern] * len(self.search_columns)
+
+    def count(self, filter: str | None = None) -> int:
+        where, params = self.where(filter)
+        sql = f'SELECT COUNT(*) FROM {quote_identifier(self.table)}{where}'
+        return self.connection().execute(sql, params).fetchone()[0]
+
+    def fetch(
+        self, offset: int, limit: int, sort: SortSpec | None = None, filter: str | None = None
+    ) -> list[tuple]:
+        where, params = self.where(filter)
+        key = quote_identifier(self.key_column)
+        order = f' ORDER BY {key}'
+        if sort is not None:
+            column_index, ascending = sort
+            direction = 'ASC' if ascending else 'DESC'
+            order = f' ORDER BY {quote_identifier(self.columns[column_index])} {direction}, {key}'
+        names = ', '.join(quote_identifier(column) for column in self.columns)
+        sql = f'SELECT {names} FROM {quote_identifier(self.table)}{where}{order} LIMIT ? OFFSET ?'
+        return self.connection().execute(sql, params + [limit, offset]).fetchall()
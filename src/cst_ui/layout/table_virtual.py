@@ -0,0 +1,114 @@
+"""
+表格的虚拟滚动行：
+只构建可视区域（加上 overscan）内的行，滚动时按行号复用行控件，10 万行也只发送几十行到客户端。
+"""
+
+import math
+from dataclasses import dataclass
+from typing import Any, Callable
+
+import flet as ft
+
+ROW_HOVER_COLOR = ft.Colors.with_opacity(0.1, ft.Colors.BLUE)
+ROW_BORDER = ft.Border.only(bottom=ft.BorderSide(1, '#EDEEF4'))
+
+
+@dataclass
+class VirtualRows(ft.Column):
+    """
+    固定行高的虚拟滚动区域，`get_value(行号, 列号)` 提供单元格的值。
+    """
+
+    total_rows: int = 0  # 总行数
+    column_count: int = 0  # 列数
+    get_value: Callable[[int, int], Any] | None = None  # 单元格取值函数
+    row_height: int = 48  # 行高（固定）
+    viewport_height: int = 480  # 可视区域高度
+    overscan: int = 10  # 可视区域上下额外构建的行数
+
+    def __post_init__(self, ref: ft.Ref[Any] | None):
+        # 行控件池，行号 index 固定使用 pool[index % len(pool)]，滚动时只改写行号变化的行
+        self.pool_size = math.ceil(self.viewport_height / self.row_height) + 2 * self.overscan + 1
+        self.pool: list[ft.Container] = []
+        self.scroll_pixels = 0.0
+
+        # 撑开滚动高度的画布，行控件按 top 定位
+        self.v_canvas = ft.Stack(controls=self.pool, height=self.total_rows * self.row_height)
+
+        self.controls = [self.v_canvas]
+        self.height = self.viewport_height
+        self.spacing = 0
+        self.scroll = ft.ScrollMode.AUTO
+        self.scroll_interval = 30
+        self.on_scroll = self.handle_scroll
+        self.render()
+        super().__post_init__(ref)
+
+    def build_row_control(self) -> ft.Container:
+        """构建一个可复用的行控件"""
+        return ft.Container(
+            content=ft.Row(
+                controls=[ft.Container(content=ft.Text(''), expand=1) for _ in range(self.column_count)],
+                spacing=0,
+            ),
+            left=0,
+            right=0,
+            height=self.row_height,
+            padding=ft.Padding.only(left=16, right=16),
+            border=ROW_BORDER,
+            on_hover=self.handle_row_hover,
+            visible=False,
+        )
+
+    def handle_row_hover(self, e):
+        """行悬浮颜色"""
+        e.control.bgcolor = ROW_HOVER_COLOR if e.data in (True, 'true') else None
+        e.control.update()
+
+    def fill_row(self, row_control: ft.Container, index: int):
+        """把行控件改写为第 index 行"""
+        row_control.data = index
+        row_control.top = index * self.row_height
+        row_control.visible = True
+        for column_index, cell in enumerate(row_control.content.controls):
+            value = self.get_value(index, column_index) if self.get_value else ''
+            cell.content.value = '' if value is None else str(value)
+
+    def render(self):
+        """按当前滚动位置构建可视行，行号没变的行不会被改写"""
+        first = max(0, int(self.scroll_pixels // self.row_height) - self.overscan)
+        last = min(self.total_rows, first + self.pool_size)
+
+        while len(self.pool) < min(self.pool_size, self.total_rows):
+            self.pool.append(self.build_row_control())
+
+        used = set()
+        for index in range(first, last):
+            slot = index % len(self.pool)
+            used.add(slot)
+            if self.pool[slot].data != index:
+                self.fill_row(self.pool[slot], index)
+        for slot, row_control in enumerate(self.pool):
+            if slot not in used and row_control.visible:
+                row_control.visible = False
+                row_control.data = None
+
+    def handle_scroll(self, e: ft.OnScrollEvent):
+        """滚动事件：只改写进入可视区域的行"""
+        self.scroll_pixels = e.pixels
+        self.render()
+        self.update()
+
+    def set_total_rows(self, total_rows: int, column_count: int | None = None):
+        """数据变化后重新渲染（行数、列数或单元格的值）"""
+        if column_count is not None and column_count != self.column_count:
+            self.column_count = column_count
+            self.pool.clear()
+        self.total_rows = total_rows
+        self.v_canvas.height = total_rows * self.row_height
+        max_pixels = max(0, total_rows * self.row_height - self.viewport_height)
+        self.scroll_pixels = min(self.scroll_pixels, max_pixels)
+        for row_control in self.pool:
+            row_control.data = None
+        del self.pool[max(total_rows, 0) :]
+        self.render()
@@ -0,0 +1,72 @@
+import asyncio
+from datetime import timedelta
+from types import SimpleNamespace
+
+from cst_ui.basic.app.my_types import ExpiryScheduler, Job
+
+
+def make_job(fired: list, key: str, milliseconds: float) -> Job:
+    page = SimpleNamespace(run_task=lambda handler: asyncio.get_running_loop().create_task(handler()))
+    return Job(
+        func=lambda key: lambda: fired.append(key),
+        key=key,
+        every=timedelta(milliseconds=milliseconds),
+        page=page,
+        login_done=lambda: True,
+    )
+
+
+async def start(jobs: list):
+    for job in jobs:
+        job.start()
+    # `start` registers the job from a task of the loop.
+    await asyncio.sleep(0)
+
+
+def test_jobs_fire_in_order():
+    fired = []
+
+    async def main():
+        await start([make_job(fired, "c", 60), make_job(fired, "a", 20), make_job(fired, "b", 40)])
+        assert len(ExpiryScheduler.get()) == 3
+        await asyncio.sleep(0.15)
+        assert len(ExpiryScheduler.get()) == 0
+
+    asyncio.run(main())
+    assert fired == ["a", "b", "c"]
+
+
+def test_stop_cancels_the_job():
+    fired = []
+
+    async def main():
+        stopped, kept = make_job(fired, "stopped", 20), make_job(fired, "kept", 40)
+        await start([stopped, kept])
+        stopped.stop()
+        await asyncio.sleep(0)
+        assert len(ExpiryScheduler.get()) == 1
+        await asyncio.sleep(0.1)
+
+    asyncio.run(main())
+    assert fired == ["kept"]
+
+
+def test_heap_is_compacted_after_mass_cancellation():
+    fired = []
+
+    async def main():
+        jobs = [make_job(fired, str(i), 50 + i / 10) for i in range(100)]
+        await start(jobs)
+        for i, job in enumerate(jobs):
+            if i % 5:
+                job.stop()
+        await asyncio.sleep(0)
+
+        scheduler = ExpiryScheduler.get()
+        assert len(scheduler) == 20
+        # The cancelled entries are dropped once they are the majority of the heap.
+        assert len(scheduler._ExpiryScheduler__heap) < 60
+        await asyncio.sleep(0.2)
+
+    asyncio.run(main())
+    assert fired == [str(i) for i in range(0, 100, 5)]
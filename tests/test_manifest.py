@@ -0,0 +1,162 @@
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+from cst_ui.basic.app import manifest
+from cst_ui.basic.app.manifest import ManifestCache, scan_file
+
+FILE = Path("views/users.py")
+
+
+def routes(source: str):
+    entries = scan_file(FILE, source)
+    return None if entries is None else [entry.route for entry in entries]
+
+
+def test_scan_add_page_admin_decorators():
+    source = """
+import cst_ui as ui
+
+users = ui.AddPageAdmin("/users")
+
+
+@users.page("/", title="Users")
+def index(data):
+    ...
+
+
+@users.page(route="/new", keep_alive=True)
+async def new(data):
+    ...
+"""
+    assert routes(source) == ["/users", "/users/new"]
+
+
+def test_scan_unknown_page_decorator_needs_import():
+    # A bare `page` function, an attribute of an unknown object or an undecorated call are not understood.
+    for decorator in ['@page("/x")', "@page", '@other.page("/x")', '@module.users.page("/x")', "@users.page"]:
+        source = f"""
+users = AddPageAdmin()
+
+
+{decorator}
+def view(data):
+    ...
+"""
+        assert routes(source) is None, decorator
+
+
+def test_scan_other_uses_need_import():
+    source = """
+users = AddPageAdmin()
+users.page("/detail")(print)
+"""
+    assert routes(source) is None
+
+
+PAGE_SOURCE = """
+users = AddPageAdmin("/users")
+
+
+@users.page("{route}")
+def view(data):
+    ...
+"""
+
+
+@pytest.fixture
+def scans(monkeypatch):
+    """Files actually parsed by the cache."""
+    scanned = []
+
+    def counting_scan_file(file, source=None):
+        scanned.append(file.name)
+        return scan_file(file, source)
+
+    monkeypatch.setattr(manifest, "scan_file", counting_scan_file)
+    return scanned
+
+
+def write_page(file: Path, route: str):
+    file.write_text(PAGE_SOURCE.format(route=route), encoding="utf-8")
+
+
+def cached_routes(cache_file: Path, views: Path) -> dict:
+    cache = ManifestCache(cache_file, views)
+    routes = {file.name: [entry.route for entry in cache.scan(file)] for file in sorted(views.glob("*.py"))}
+    cache.save()
+    return routes
+
+
+def test_cache_reuses_unchanged_files(tmp_path, scans):
+    views = tmp_path / "views"
+    views.mkdir()
+    write_page(views / "a.py", "/a")
+    cache_file = tmp_path / "routes.json"
+
+    assert cached_routes(cache_file, views) == {"a.py": ["/users/a"]}
+    # Same mtime and size: the file is not read.
+    assert cached_routes(cache_file, views) == {"a.py": ["/users/a"]}
+    assert scans == ["a.py"]
+
+    # Only the mtime changed: the sha1 matches, the file is not parsed again.
+    stat = (views / "a.py").stat()
+    os.utime(views / "a.py", ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert cached_routes(cache_file, views) == {"a.py": ["/users/a"]}
+    assert scans == ["a.py"]
+    record = json.loads(cache_file.read_text(encoding="utf-8"))["files"]["a.py"]
+    assert record["mtime_ns"] == stat.st_mtime_ns + 10**9
+
+
+def test_cache_rescans_changed_and_drops_deleted_files(tmp_path, scans):
+    views = tmp_path / "views"
+    views.mkdir()
+    write_page(views / "a.py", "/a")
+    write_page(views / "b.py", "/b")
+    cache_file = tmp_path / "routes.json"
+    cached_routes(cache_file, views)
+    scans.clear()
+
+    write_page(views / "a.py", "/changed")
+    (views / "b.py").unlink()
+    assert cached_routes(cache_file, views) == {"a.py": ["/users/changed"]}
+    assert scans == ["a.py"]
+    assert list(json.loads(cache_file.read_text(encoding="utf-8"))["files"]) == ["a.py"]
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        "{not json",
+        "[]",
+        json.dumps({"version": manifest.MANIFEST_VERSION - 1, "files": {}}),
+        json.dumps({"version": manifest.MANIFEST_VERSION, "file_dir": "/other/views", "files": {}}),
+    ],
+)
+def test_cache_ignores_corrupt_or_foreign_file(tmp_path, scans, content):
+    views = tmp_path / "views"
+    views.mkdir()
+    write_page(views / "a.py", "/a")
+    cache_file = tmp_path / "routes.json"
+    cache_file.write_text(content, encoding="utf-8")
+
+    assert cached_routes(cache_file, views) == {"a.py": ["/users/a"]}
+    assert scans == ["a.py"]
+    assert json.loads(cache_file.read_text(encoding="utf-8"))["version"] == manifest.MANIFEST_VERSION
+
+
+def test_cache_rescans_invalid_records(tmp_path, scans):
+    views = tmp_path / "views"
+    views.mkdir()
+    write_page(views / "a.py", "/a")
+    cache_file = tmp_path / "routes.json"
+    cached_routes(cache_file, views)
+    data = json.loads(cache_file.read_text(encoding="utf-8"))
+    data["files"]["a.py"]["entries"] = [{"route": "/users/a", "unknown": 1}]
+    cache_file.write_text(json.dumps(data), encoding="utf-8")
+    scans.clear()
+
+    assert cached_routes(cache_file, views) == {"a.py": ["/users/a"]}
+    assert scans == ["a.py"]
@@ -0,0 +1,48 @@
+import time
+
+import flet as ft
+
+from cst_ui.basic.app.inheritance import ResponsiveControl
+from cst_ui.basic.app.limiter import RateLimiter
+
+INTERVAL = 0.05
+
+
+def test_debounce_runs_only_the_last_call():
+    calls = []
+    limiter = RateLimiter(calls.append, INTERVAL, "debounce")
+    for size in range(10):
+        limiter(size)
+    assert calls == []
+    time.sleep(INTERVAL * 4)
+    assert calls == [9]
+
+
+def test_throttle_runs_leading_and_one_trailing_call():
+    calls = []
+    limiter = RateLimiter(calls.append, INTERVAL, "throttle")
+    for size in range(10):
+        limiter(size)
+    assert calls == [0]
+    time.sleep(INTERVAL * 4)
+    assert calls == [0, 9]
+
+
+def test_flush_and_cancel():
+    calls = []
+    limiter = RateLimiter(calls.append, 10, "debounce")
+    limiter(1)
+    limiter.flush()
+    limiter(2)
+    limiter.cancel()
+    assert calls == [1]
+
+
+def test_responsive_control_default_resize_interval():
+    # The default was 1 ms, it is now 100 ms and also the window of the debounce of `resize_mode`.
+    control = ResponsiveControl(content=ft.Container(), expand=1)
+    assert control.resize_interval == 100
+    assert control._ResponsiveControl__limiter.interval == 0.1
+
+    control = ResponsiveControl(content=ft.Container(), expand=1, resize_interval=1, resize_mode=None)
+    assert control._ResponsiveControl__limiter is None
@@ -0,0 +1,72 @@
+from cst_ui.basic.app.page_admin import PageAdmin
+from cst_ui.basic.app.route_trie import RouteTrie
+
+
+def view(data):
+    return None
+
+
+def resolve(routes: RouteTrie, url: str):
+    resolved = routes.resolve(url)
+    return None if resolved is None else (resolved[0].route, resolved[1])
+
+
+def test_static_before_param():
+    # The parameter page is registered first, the static segment still wins.
+    routes = RouteTrie([PageAdmin("/users/{name:str}", view), PageAdmin("/users/new", view)])
+    assert resolve(routes, "/users/new") == ("/users/new", {})
+    assert resolve(routes, "/users/ana") == ("/users/{name:str}", {"name": "ana"})
+
+
+def test_static_falls_back_to_param():
+    routes = RouteTrie([PageAdmin("/a/b/c", view), PageAdmin("/a/{x:str}/d", view)])
+    assert resolve(routes, "/a/b/d") == ("/a/{x:str}/d", {"x": "b"})
+
+
+def test_registration_order_for_same_shape():
+    routes = RouteTrie([PageAdmin("/item/{id:int}", view), PageAdmin("/item/{code:int}", view)])
+    assert resolve(routes, "/item/7") == ("/item/{id:int}", {"id": 7})
+
+
+def test_trailing_slash():
+    routes = RouteTrie([PageAdmin("/home", view), PageAdmin("/", view)])
+    assert resolve(routes, "/home/") == ("/home", {})
+    assert resolve(routes, "/") == ("/", {})
+    assert resolve(routes, "/home//") is None
+
+
+def test_empty_segments():
+    routes = RouteTrie([PageAdmin("/a/b", view), PageAdmin("/a/{x:str}", view)])
+    assert resolve(routes, "/a//b") is None
+    assert resolve(routes, "//a/b") is None
+    assert resolve(routes, "a/b") is None
+
+
+def test_typed_params():
+    routes = RouteTrie(
+        [
+            PageAdmin("/n/{value:int}", view),
+            PageAdmin("/n/{value:float}", view),
+            PageAdmin("/flag/{on:bool}", view),
+        ]
+    )
+    assert resolve(routes, "/n/-3") == ("/n/{value:int}", {"value": -3})
+    assert resolve(routes, "/n/1.5") == ("/n/{value:float}", {"value": 1.5})
+    assert resolve(routes, "/n/abc") is None
+    assert resolve(routes, "/flag/true") == ("/flag/{on:bool}", {"on": True})
+    assert resolve(routes, "/flag/yes") is None
+
+
+def test_custom_param_rejection():
+    def is_even(value: str):
+        return int(value) if value.isdigit() and int(value) % 2 == 0 else None
+
+    routes = RouteTrie(
+        [
+            PageAdmin("/even/{n:even}", view, custom_params={"even": is_even}),
+            PageAdmin("/even/{n:str}", view),
+        ]
+    )
+    assert resolve(routes, "/even/4") == ("/even/{n:even}", {"n": 4})
+    # The custom type rejects the value, the next page of the same shape is tried.
+    assert resolve(routes, "/even/3") == ("/even/{n:str}", {"n": "3"})
@@ -0,0 +1,69 @@
+from sys import getsizeof
+
+from cst_ui.basic.app.inheritance import SessionStorageEdit, estimate_size
+
+
+class Frame:
+    """Reports its own size, like a DataFrame."""
+
+    def __init__(self, size: int):
+        self.size = size
+
+    def memory_usage(self, deep: bool = False) -> int:
+        return self.size
+
+
+def test_estimate_size():
+    assert estimate_size(Frame(5000)) == 5000
+    assert estimate_size(b"x" * 1000) >= 1000
+    values = ["a" * 1000, "b" * 1000]
+    assert estimate_size(values) == getsizeof(values, 0) + sum(getsizeof(value, 0) for value in values)
+
+
+def test_eviction_by_size():
+    share = SessionStorageEdit(max_bytes=250)
+    share.set("a", Frame(100))
+    share.set("b", Frame(100))
+    # Reading `a` makes `b` the least recently used value.
+    share.get("a")
+    share.set("c", Frame(100))
+    assert share.get_keys() == ["a", "c"]
+    assert share.nbytes == 200
+    assert share.size_of("b") == 0
+
+    # The last value set is kept even when it is over the limit alone.
+    share.set("big", Frame(1000))
+    assert share.get_keys() == ["big"]
+    assert share.nbytes == 1000
+
+
+def test_snapshot_and_restore():
+    share = SessionStorageEdit()
+    share.set("a", 1)
+    snapshot = share.snapshot()
+    share.set("a", 2)
+    share.set("b", 3)
+    share.remove("a")
+    assert snapshot.get("a") == 1 and "b" not in snapshot
+
+    share.restore(snapshot)
+    assert share.get_all() == {"a": 1}
+    assert share.nbytes == snapshot.nbytes
+
+
+def test_copy_on_write_between_sessions():
+    first, second = SessionStorageEdit(), SessionStorageEdit()
+    value = ["shared"]
+    first.set("rows", value)
+    first.set("page", 1)
+    snapshot = first.snapshot()
+    second.restore(snapshot)
+    # The values themselves are shared, not copied.
+    assert second.get("rows") is value
+
+    first.set("page", 2)
+    second.set("page", 3)
+    second.remove("rows")
+    assert first.get_all() == {"rows": value, "page": 2}
+    assert second.get_all() == {"page": 3}
+    assert snapshot.get("page") == 1 and len(snapshot) == 2
@@ -0,0 +1,91 @@
+import asyncio
+
+import pytest
+
+from cst_ui.basic.app import cache as cache_module
+from cst_ui.basic.app.cache import SharedCache
+
+
+def test_concurrent_callers_load_once():
+    cache = SharedCache()
+    loads = []
+
+    async def loader():
+        loads.append(1)
+        await asyncio.sleep(0.01)
+        return "value"
+
+    async def main():
+        return await asyncio.gather(*(cache.get_or_load_async("key", loader) for _ in range(20)))
+
+    assert asyncio.run(main()) == ["value"] * 20
+    assert len(loads) == 1
+    assert cache.info().misses == 1
+
+
+def test_cancelled_loader_hands_off_to_waiters():
+    cache = SharedCache()
+    loads = []
+
+    async def main():
+        first_started = asyncio.Event()
+
+        async def loader():
+            loads.append(1)
+            if len(loads) == 1:
+                first_started.set()
+                await asyncio.sleep(10)
+            return "value"
+
+        first = asyncio.create_task(cache.get_or_load_async("key", loader))
+        await first_started.wait()
+        waiter = asyncio.create_task(cache.get_or_load_async("key", loader))
+        await asyncio.sleep(0)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await asyncio.wait_for(waiter, 1)
+
+    # The waiter loads the key again instead of failing with the cancellation.
+    assert asyncio.run(main()) == "value"
+    assert len(loads) == 2
+    assert cache.get("key") == "value"
+
+
+def test_failed_load_is_not_cached():
+    cache = SharedCache()
+    calls = []
+
+    def loader():
+        calls.append(1)
+        if len(calls) == 1:
+            raise RuntimeError("down")
+        return "value"
+
+    with pytest.raises(RuntimeError):
+        cache.get_or_load("key", loader)
+    assert "key" not in cache
+    assert cache.get_or_load("key", loader) == "value"
+    assert len(calls) == 2
+
+
+def test_ttl_expiry(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(cache_module, "monotonic", lambda: now[0])
+    cache = SharedCache(ttl=10)
+    calls = []
+
+    def loader():
+        calls.append(1)
+        return len(calls)
+
+    assert cache.get_or_load("key", loader) == 1
+    now[0] += 9
+    assert cache.get_or_load("key", loader) == 1
+    now[0] += 1
+    assert "key" not in cache
+    assert cache.get_or_load("key", loader) == 2
+    # The ttl of the call wins over the default one.
+    assert cache.get_or_load("other", loader, ttl=1) == 3
+    now[0] += 1
+    assert cache.get("other") is None
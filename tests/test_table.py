@@ -0,0 +1,98 @@
+import flet as ft
+import pytest
+
+from cst_ui.layout.table import Table
+from cst_ui.layout.table_data import TableData
+
+
+def on_select(e):
+    return e
+
+
+def make_data_table() -> ft.DataTable:
+    rows = [
+        ft.DataRow(
+            cells=[ft.DataCell(ft.Text('Ann')), ft.DataCell(ft.Checkbox(value=True))],
+            selected=True,
+            on_select_changed=on_select,
+        ),
+        ft.DataRow(cells=[ft.DataCell(ft.Text('Bob')), ft.DataCell(ft.Checkbox(value=False))]),
+    ]
+    return ft.DataTable(
+        columns=[ft.DataColumn(label=ft.Text('name')), ft.DataColumn(label=ft.Text('active'))], rows=rows
+    )
+
+
+def test_data_table_keeps_cell_controls_and_row_properties():
+    data_table = make_data_table()
+    ann, bob = data_table.rows
+    checkbox = ann.cells[1].content
+    table = Table(data_table=data_table)
+
+    assert table.ft_data_table.rows == [ann, bob]
+    assert [cell.content.value for cell in ann.cells[:2]] == ['1', 'Ann']
+    assert ann.cells[2].content is checkbox
+    assert ann.selected and ann.on_select_changed is on_select
+    # values are only used for sorting and searching
+    assert table.data_rows[0] == ('Ann', True)
+
+    table.sort_by(0, False)
+    assert table.ft_data_table.rows == [bob, ann]
+    assert ann.cells[0].content.value == '2'
+    assert ann.cells[2].content is checkbox
+
+
+class RecordingText:
+    """Stands in for the Text of a cell and records the values written to it."""
+
+    def __init__(self, writes: list, key: int, column_index: int, value: str):
+        self.writes = writes
+        self.key = key
+        self.column_index = column_index
+        self._value = value
+
+    @property
+    def value(self):
+        return self._value
+
+    @value.setter
+    def value(self, value):
+        self.writes.append((self.key, self.column_index, value))
+        self._value = value
+
+
+def record_writes(table: Table) -> list:
+    writes = []
+    for row in table.ft_data_table.rows:
+        for column_index, cell in enumerate(row.cells):
+            cell.content = RecordingText(writes, row.data, column_index, cell.content.value)
+    return writes
+
+
+def test_keyed_rows_keep_their_controls():
+    table = Table(source={'name': ['a', 'b', 'c'], 'age': [3, 1, 2]})
+    rows = {row.data: row for row in table.ft_data_table.rows}
+    writes = record_writes(table)
+
+    table.set_cell_value(1, 1, 5)
+    assert all(row is rows[row.data] for row in table.ft_data_table.rows)
+    assert writes == [(1, 2, '5')]
+
+    # Sorted by age (3, 5, 2): every row keeps its control, only the numbers of the moved rows change.
+    writes.clear()
+    table.sort_by(1, True)
+    assert [row.data for row in table.ft_data_table.rows] == [2, 0, 1]
+    assert all(row is rows[row.data] for row in table.ft_data_table.rows)
+    assert sorted(writes) == [(0, 0, '2'), (1, 0, '3'), (2, 0, '1')]
+
+    writes.clear()
+    table.refresh_data()
+    assert writes == []
+
+
+def test_table_data_append_checks_row_length():
+    table_data = TableData.from_source({'name': ['a'], 'age': [1]})
+    with pytest.raises(ValueError):
+        table_data.append(('b',))
+    table_data.append(('b', 2))
+    assert len(table_data) == 2
@@ -0,0 +1,83 @@
+import random
+
+from cst_ui.layout.table_data import TableData
+from cst_ui.layout.table_index import TableIndex, sort_key
+
+
+def make_index(columns: dict) -> TableIndex:
+    return TableIndex(TableData.from_source(columns))
+
+
+def check_order(index: TableIndex, column_index: int):
+    """The cached order holds every row once, sorted by (key, row)."""
+    order = index.sort_orders[column_index]
+    keys = index.sort_keys[column_index]
+    assert sorted(order) == list(range(len(index.table_data)))
+    assert all((keys[a], a) < (keys[b], b) for a, b in zip(order, order[1:]))
+
+
+def test_sort_key_nulls_last():
+    values = [3, None, 'b', float('nan'), 1.5, 'a']
+    assert sorted(values, key=sort_key)[:4] == [1.5, 3, 'a', 'b']
+    assert sort_key(None) == sort_key(float('nan'))
+
+
+def test_sort_ascending_and_descending():
+    index = make_index({'name': ['c', 'a', 'b'], 'age': [30, None, 10]})
+    assert index.rows((0, True)) == [1, 2, 0]
+    assert index.rows((0, False)) == [0, 2, 1]
+    assert index.rows((1, True)) == [2, 0, 1]
+    assert index.rows() is None
+
+
+def test_sort_order_is_cached():
+    index = make_index({'age': [3, 1, 2]})
+    order = index.sort_order(0)
+    assert index.sort_order(0) is order
+
+
+def test_search_prefix_and_all_words():
+    index = make_index({'name': ['John Smith', 'Jane Doe', 'johnny Walker'], 'city': ['Paris', 'Rome', 'Paris']})
+    assert index.search('jo') == {0, 2}
+    assert index.search('JOHN paris') == {0, 2}
+    assert index.search('jane paris') == set()
+    assert index.search('  ') is None
+    assert index.rows((0, True), 'paris') == [0, 2]
+
+
+def test_append_updates_indexes():
+    index = make_index({'name': ['b', 'd'], 'age': [2, 4]})
+    index.sort_order(1)
+    index.search('b')
+    index.table_data.append(('c', 3))
+    index.append(2)
+    assert index.rows((1, True)) == [0, 2, 1]
+    assert index.search('c') == {2}
+    check_order(index, 1)
+
+
+def test_update_value_updates_indexes():
+    index = make_index({'name': ['alpha', 'beta'], 'tag': ['x', 'alpha']})
+    index.sort_order(0)
+    index.search('a')
+    old_value = index.table_data.value(0, 0)
+    index.table_data.set_value(0, 0, 'gamma')
+    index.update_value(0, 0, old_value)
+    assert index.rows((0, True)) == [1, 0]
+    assert index.search('gamma') == {0}
+    # 'alpha' is still in the other column of row 1
+    assert index.search('alpha') == {1}
+    check_order(index, 0)
+
+
+def test_update_value_with_nan_keeps_order():
+    rng = random.Random(1)
+    choices = [float('nan'), None, 1.0, 2.0, 'a']
+    index = make_index({'value': [rng.choice(choices) for _ in range(40)]})
+    index.sort_order(0)
+    for _ in range(200):
+        row_index = rng.randrange(40)
+        old_value = index.table_data.value(row_index, 0)
+        index.table_data.set_value(row_index, 0, rng.choice(choices))
+        index.update_value(row_index, 0, old_value)
+    check_order(index, 0)
@@ -0,0 +1,38 @@
+import sqlite3
+
+from cst_ui.layout.table_provider import SQLiteProvider
+
+
+def make_provider(tmp_path, rows: int) -> SQLiteProvider:
+    path = tmp_path / 'data.db'
+    with sqlite3.connect(path) as connection:
+        connection.execute('CREATE TABLE users (name TEXT, team TEXT)')
+        # Few distinct teams: most rows have the same sort key.
+        connection.executemany('INSERT INTO users VALUES (?, ?)', [(f'user{i}', f'team{i % 3}') for i in range(rows)])
+    return SQLiteProvider(str(path), 'users')
+
+
+def fetch_pages(provider: SQLiteProvider, page_size: int, sort=None, filter=None) -> list:
+    rows = []
+    for offset in range(0, provider.count(filter), page_size):
+        rows.extend(provider.fetch(offset, page_size, sort, filter))
+    return rows
+
+
+def test_paging_with_equal_sort_keys(tmp_path):
+    provider = make_provider(tmp_path, 1000)
+    for sort in [None, (1, True), (1, False)]:
+        rows = fetch_pages(provider, 7, sort)
+        # Every row once: none repeated or skipped across the pages.
+        assert len(rows) == 1000
+        assert len(set(rows)) == 1000
+    teams = [team for _, team in fetch_pages(provider, 7, (1, False))]
+    assert teams == sorted(teams, reverse=True)
+
+
+def test_paging_with_filter(tmp_path):
+    provider = make_provider(tmp_path, 100)
+    assert provider.count('team1') == 33
+    rows = fetch_pages(provider, 10, (1, True), 'team1')
+    assert len(set(rows)) == 33
+    assert {team for _, team in rows} == {'team1'}